@@ -19,6 +19,8 @@ def main():
     while running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if game is not None:
+                    game.cancel_ai()
                 running = False
             elif event.type == pygame.VIDEORESIZE:
                 # Update global size and recreate screen surface
@@ -46,6 +48,8 @@ def main():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     if state == "game":
+                        # Stoppe la recherche IA de la partie abandonnée
+                        game.cancel_ai()
                         state = "menu"
                         game = None
                         menu = Menu(screen)
@@ -53,6 +57,7 @@ def main():
                         running = False
                 # Restart current game by pressing R
                 if event.key == pygame.K_r and state == "game":
+                    game.cancel_ai()
                     # Recreate game with same parameters
                     try:
                         game = Game(screen,
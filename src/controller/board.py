@@ -4,7 +4,7 @@ from src.gui.pieces import Piece
 from src.model.prologRules.prolog_manager import PrologManager
 
 class Board:
-    def __init__(self, surface):
+    def __init__(self, surface, manager=None):
         self.surface = surface
         self.points = []
         self.player1_pieces = []
@@ -12,7 +12,8 @@ class Board:
         self.occupied_positions = []
         self.phase = "placement"
 
-        self.manager = PrologManager()
+        # Manager partagé avec le moteur IA si fourni
+        self.manager = manager if manager is not None else PrologManager()
         # === coordonnées logiques : 0..4 ===
         for row in range(config.BOARD_ROWS):
             for col in range(config.BOARD_ROWS):
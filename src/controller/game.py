@@ -4,11 +4,14 @@ from src.controller.board import Board
 from src.gui.banner import Banner
 from src.gui.sounds import play_sound
 from src.model.ai.ai_engine import AIEngine
+from src.model.prologRules.cached_manager import CachedPrologManager
 
 class Game:
     def __init__(self, surface, mode, difficulty, player1_name, player2_name):
         self.surface = surface
-        self.board = Board(surface)
+        # Un seul manager Prolog (avec cache) partagé par le plateau et le moteur IA
+        self.manager = CachedPrologManager(max_entries=config.RULES_CACHE_SIZE)
+        self.board = Board(surface, manager=self.manager)
         self.banner = Banner(surface, player1_name, player2_name)
         self.current_player = 1
         self.selected_piece = None  # pour la phase de déplacement
@@ -17,11 +20,13 @@ class Game:
         self.message_timer = 0
         self.status_message = ""  # For persistent status display
         self.ai_thinking = False
+        self.ai_future = None  # recherche IA en cours (thread de fond)
 
         self.mode = mode
         self.difficulty = difficulty
 
-        self.engine = AIEngine(difficulty=self.difficulty, mode=self.mode)
+        self.engine = AIEngine(difficulty=self.difficulty, mode=self.mode, rules=config.AI_RULES_BACKEND,
+                               manager=self.manager, worker=config.AI_SEARCH_WORKER)
         
         self.p1 = player1_name
         self.p2 = player2_name
@@ -175,13 +180,29 @@ class Game:
             pygame.time.set_timer(pygame.USEREVENT+1, 500)
 
     def ai_play(self):
-        """AI turn"""
+        """AI turn : lance la recherche en arrière-plan, le coup est appliqué dans update()"""
+        if self.game_over or self.ai_future is not None:
+            return
+
         prolog_player = self.player_to_prolog(self.current_player)
         self.ai_thinking = True
         current_name = self.p1 if self.current_player == 1 else self.p2
-        self.show_message(f"{current_name} is thinking...", duration=config.AI_THINKING_DELAY)
+        self.show_message(f"{current_name} is thinking...", duration=config.AI_THINKING_MAX_DISPLAY)
+
+        self.ai_future = self.engine.get_best_move_async(self.board.to_prolog_state(), prolog_player)
+
+    def cancel_ai(self):
+        """Abandonne la recherche en cours (ESC / R / fermeture)"""
+        if self.ai_future is not None:
+            self.ai_future = None
+            self.ai_thinking = False
+        self.engine.shutdown()
+
+    def finish_ai_move(self, ai_move):
+        """Applique le coup rendu par la recherche"""
+        prolog_player = self.player_to_prolog(self.current_player)
+        self.phase_message = ""
 
-        ai_move = self.engine.get_best_move(self.board.to_prolog_state(), prolog_player)
         if ai_move:
             new_state = self.engine.apply_move(self.board.to_prolog_state(), prolog_player, ai_move)
             
@@ -238,6 +259,17 @@ class Game:
 
     def update(self):
         """Update game state"""
+        # Résultat de la recherche IA disponible ?
+        if self.ai_future is not None and self.ai_future.done():
+            future = self.ai_future
+            self.ai_future = None
+            try:
+                ai_move = future.result()
+            except Exception as e:
+                print(f"[Game] Erreur pendant la recherche IA : {e}")
+                ai_move = None
+            self.finish_ai_move(ai_move)
+
         if self.phase_message and pygame.time.get_ticks() > self.message_timer:
             self.phase_message = ""
 
@@ -111,6 +111,12 @@ SOUND_PATHS = {
 
 
 # ========== AI SETTINGS ==========
+# Rules backend used by the AI engine: "prolog" (reference rules) or "bitboard" (pure Python, fast)
+AI_RULES_BACKEND = "bitboard"
+# Where the AI search runs: "thread" (background thread) or "process" (dedicated worker process, no GIL contention)
+AI_SEARCH_WORKER = "process"
+# Maximum number of memoized rules queries (LRU) shared by the board and the AI
+RULES_CACHE_SIZE = 200000
 # Default AI difficulty level
 AI_DEFAULT_DIFFICULTY = "medium"  # options: 'easy', 'medium', 'hard'
 # Mapping difficulty levels to search depths
@@ -122,6 +128,8 @@ AI_SEARCH_DEPTHS = {
 
 # Time delay (ms) for AI "thinking" simulation
 AI_THINKING_DELAY = 800  # milliseconds
+# Maximum time (ms) the "is thinking..." message stays up while the background search runs
+AI_THINKING_MAX_DISPLAY = 15000  # milliseconds
 # Time delay (ms) before showing victory/defeat message
 AI_ENDGAME_DELAY = 1000  # milliseconds
 # Maximum time (seconds) allowed for AI to make a move
@@ -4,24 +4,46 @@ Fichier central de notre architecture. Il est responsable de la communication en
 """
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from prologRules.prolog_manager import PrologManager
+from prologRules.bitboard_rules import BitboardRules, TeekoState
 from prologRules.ia_helper import python_to_move_tuple
 from ai.evaluation import Evaluation
 
 from ai.minmax_alphabeta import MinMaxAlphaBeta
+from ai.transposition import CompactTranspositionTable, SharedTranspositionTable
+from ai.eval_cache import EvalCache
+from ai.search_worker import SearchWorker
+from ai.parallel_search import ParallelRootSearch
+from ai.lazy_smp import LazySMP
+from ai.tablebase import Tablebase
+from ai.opening_book import OpeningBook
 
 class AIEngine:
-    def __init__(self, prolog_file="teeko_rules.pl", difficulty=None, mode=None):
-        # Manager pour communiquer avec Prolog
-        self.manager = PrologManager(prolog_file)
+    def __init__(self, prolog_file="teeko_rules.pl", difficulty=None, mode=None, rules="prolog", manager=None,
+                 worker="thread", workers=None):
+        # Backend des règles pour la recherche : "prolog" (référence) ou "bitboard" (Python pur, sans FFI)
+        # Manager des appels de la GUI (peut être partagé, ex. CachedPrologManager) ; sans manager
+        # fourni, les règles bitboard servent aussi à la GUI : SWI-Prolog n'est jamais chargé
+        self.prolog_file = prolog_file
+        self.rules = rules
+        if rules == "bitboard":
+            self.search_manager = BitboardRules()
+            self.manager = manager if manager is not None else self.search_manager
+        else:
+            if manager is None:
+                # Import local : pyswip n'est chargé que si les règles Prolog servent
+                from prologRules.prolog_manager import PrologManager
+                manager = PrologManager(prolog_file)
+            self.manager = manager
+            self.search_manager = self.manager
 
         # Fonction d'évaluation
-        self.evaluator = Evaluation(self.manager)
+        self.evaluator = Evaluation(self.search_manager)
 
         # Mode de jeu (PvsP, PvsIA, IAvsIA)
         self.mode = mode
@@ -30,25 +52,159 @@ class AIEngine:
         self.difficulty = difficulty
         self.difficulty_params = self.get_difficulty_params(difficulty)
 
-        # Algorithme MinMax
-        self.minmax = MinMaxAlphaBeta(
-            manager=self.manager,
+        # Recherche parallèle si plusieurs workers :
+        #   "split" -> coups racine répartis sur un pool (ParallelRootSearch)
+        #   "smp"   -> Lazy SMP, helpers sur une table de transposition partagée
+        self.workers = workers if workers is not None else self.difficulty_params["workers"]
+        self.parallel = None
+        self.smp = None
+
+        # Table de finales (tablebase_builder.py) : ouverte au premier coup de déplacement
+        self.tablebase = None
+        self.tablebase_checked = False
+
+        # Bibliothèque d'ouvertures (book_builder.py) pour la phase de placement
+        self.book = None
+
+        # Recherche asynchrone : "thread" (même processus) ou "process" (worker dédié)
+        self.worker = worker
+        self.executor = None
+        self.search_worker = None
+        if worker == "process":
+            self.search_worker = SearchWorker(prolog_file=prolog_file, difficulty=difficulty,
+                                              mode=mode, rules=rules, workers=workers)
+
+        # Algorithme MinMax et ses tables : construits ici seulement si ce moteur cherche
+        # lui-même (pas de worker dédié, pas de partie PvsP), sinon à la première recherche locale
+        self._minmax = None
+        if worker != "process" and mode != "PvsP":
+            self._build_search()
+
+    @property
+    def minmax(self):
+        if self._minmax is None:
+            self._build_search()
+        return self._minmax
+
+    # Table de transposition (partagée si Lazy SMP), pool / helpers, bibliothèque et MinMax
+    def _build_search(self):
+        params = self.difficulty_params
+        engine_kwargs = dict(prolog_file=self.prolog_file, difficulty=self.difficulty, mode=self.mode,
+                             rules=self.rules)
+        tt = None
+        if self.workers > 1 and params["parallel"] == "smp":
+            tt = SharedTranspositionTable(params["tt_mb"])
+            self.smp = LazySMP(self.workers - 1, tt, **engine_kwargs)
+            # Helpers démarrés tout de suite : ils cherchent dès le premier coup
+            self.smp.warm_up()
+        elif self.workers > 1:
+            self.parallel = ParallelRootSearch(self.workers, **engine_kwargs)
+            # Pool démarré tout de suite : le premier coup ne paie pas le lancement des workers
+            self.parallel.warm_up()
+        if tt is None:
+            tt = CompactTranspositionTable(params["tt_mb"])
+
+        self.book = OpeningBook.open_default() if params["book"] else None
+
+        self._minmax = MinMaxAlphaBeta(
+            manager=self.search_manager,
             evaluator=self.evaluator,
             engine=self,
-            max_depth=self.difficulty_params["max_depth"],
-            time_limit=self.difficulty_params["placement_time"],
-            mode=self.mode  
+            max_depth=params["max_depth"],
+            time_limit=params["placement_time"],
+            mode=self.mode,
+            tt=tt,
+            eval_cache=EvalCache(params["eval_cache"]),
+            parallel=self.parallel,
+            smp=self.smp,
+            tablebase=self.tablebase,
+            pvs=params["pvs"],
+            aspiration=params["aspiration"],
+            quiescence=params["quiescence"]
         )
 
-    def get_best_move(self,state,player):
-        phase = self.get_phase(state)
+    # state : TeekoState (joueur au trait par défaut) ou liste ['e','b','n',...]
+    def get_best_move(self, state, player=None):
+        state, player = self.as_teeko_state(state, player)
+        phase = state.phase()
+        minmax = self.minmax
+
+        # Coup de bibliothèque : pas de recherche
+        if self.book is not None and phase == "placement":
+            move = self.book.lookup(state, player)
+            if move is not None and move in self.search_manager.get_legal_moves(state, player):
+                print(f"[Book] {move}")
+                minmax.last_stats = {"depth": 0, "score": None, "nodes": 0, "book": True}
+                return python_to_move_tuple(move)
+
         self.set_time_limit(phase)
+        self.ensure_tablebase(phase)
 
-        score, move = self.minmax.compute(state, player)
+        score, move = minmax.compute(state, player)
         if move:
             return python_to_move_tuple(move)
         return None
 
+    # (TeekoState, joueur au trait) : une liste doit venir avec son joueur
+    @staticmethod
+    def as_teeko_state(state, player):
+        if isinstance(state, TeekoState):
+            return state, (player if player is not None else state.player)
+        if player is None:
+            raise ValueError("Joueur au trait manquant : obligatoire quand l'état est une liste")
+        return TeekoState.from_list(state, player), player
+
+    # Ouvre la table de finales (mmap) au premier coup de la phase de déplacement
+    def ensure_tablebase(self, phase):
+        if self.tablebase_checked or phase == "placement":
+            return
+        self.tablebase_checked = True
+        self.tablebase = Tablebase.open_default()
+        self.minmax.tablebase = self.tablebase
+
+    # Lance la recherche dans un thread et renvoie un Future (résultat : coup ou None)
+    def get_best_move_async(self, state, player=None):
+        state, player = self.as_teeko_state(state, player)
+        if self.search_worker is not None:
+            return self.search_worker.submit(state, player)
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="teeko-ai")
+        self.minmax.stop_event.clear()
+        return self.executor.submit(self.get_best_move, state, player)
+
+    # Interrompt la recherche en cours (elle rend aussitôt son meilleur coup connu)
+    def cancel(self):
+        if self._minmax is not None:
+            self._minmax.stop_event.set()
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+        if self.parallel is not None:
+            self.parallel.cancel()
+        if self.smp is not None:
+            self.smp.cancel()
+
+    # Libère le thread de recherche (partie abandonnée) ; wait=True attend la fin du pool
+    def shutdown(self, wait=False):
+        self.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        if self.search_worker is not None:
+            self.search_worker.shutdown()
+        if self.parallel is not None:
+            self.parallel.shutdown(wait=wait)
+        if self.smp is not None:
+            self.smp.shutdown()
+
+    # Statistiques de la dernière recherche (profondeur, score, noeuds, ...)
+    def get_last_stats(self):
+        if self.search_worker is not None:
+            return self.search_worker.last_stats
+        if self._minmax is None:
+            return {}
+        return self._minmax.last_stats
+
     #valide un coup
     def validate_move(self, state, player, move):
         return self.manager.validate_move(state,player,move)
@@ -67,35 +223,25 @@ class AIEngine:
     def get_winner(self, state):
         return self.manager.winner(state)
     
-    #simuler
-    def simulate_move(self, state, player, move):
-        new_state = list(state)
-
-        # Si placement
-        if move[0] == "placement":
-            dst = move[1]
-            new_state[dst] = player
-            return new_state
-
-        # Si déplacement
-        if move[0] == "shift":
-            src, dst = move[1], move[2]
-            new_state[src] = 'e'
-            new_state[dst] = player
-            return new_state
-
-        return new_state
-    
     # Paramètres selon difficulté
     def get_difficulty_params(self, difficulty):
         if difficulty == "Débutant":
-            return {"max_depth": 3, "placement_time": 2.0, "shift_time": 5.0}
+            return {"max_depth": 3, "placement_time": 2.0, "shift_time": 5.0, "tt_mb": 4, "workers": 1,
+                    "parallel": "split", "book": False, "eval_cache": 1 << 16,
+                    "pvs": True, "aspiration": 0, "quiescence": 2}
         elif difficulty == "Intermediaire":
-            return {"max_depth": 4, "placement_time": 2.5, "shift_time": 6.5}
+            return {"max_depth": 4, "placement_time": 2.5, "shift_time": 6.5, "tt_mb": 8, "workers": 2,
+                    "parallel": "split", "book": True, "eval_cache": 1 << 17,
+                    "pvs": True, "aspiration": 0, "quiescence": 4}
         elif difficulty == "Expert":
-            return {"max_depth": 5, "placement_time": 3.0, "shift_time": 7.5}
+            return {"max_depth": 5, "placement_time": 3.0, "shift_time": 7.5, "tt_mb": 16,
+                    "workers": max(1, (os.cpu_count() or 1) - 1), "parallel": "smp",
+                    "book": True, "eval_cache": 1 << 18,
+                    "pvs": True, "aspiration": 0, "quiescence": 6}
         else:
-            return {"max_depth": 3, "placement_time": 2.5, "shift_time": 5.0}
+            return {"max_depth": 3, "placement_time": 2.5, "shift_time": 5.0, "tt_mb": 4, "workers": 1,
+                    "parallel": "split", "book": True, "eval_cache": 1 << 16,
+                    "pvs": True, "aspiration": 0, "quiescence": 4}
 
     # Ajuste le temps limite selon la phase
     def set_time_limit(self, phase):
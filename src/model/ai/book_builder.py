@@ -0,0 +1,118 @@
+"""
+Construction hors ligne de la bibliothèque d'ouvertures (phase de placement).
+
+Toutes les positions atteignables pendant les N premiers demi-coups sont énumérées à
+partir du plateau vide, une seule fois par classe de symétrie. Chacune est cherchée
+à profondeur fixe (sans limite de temps) ; on garde les coups dont le score est à
+moins de `margin` du meilleur, pour que l'IA puisse varier ses ouvertures.
+
+Usage (depuis la racine du projet) :
+    python src/model/ai/book_builder.py --plies 4 --depth 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from prologRules.bitboard_rules import BitboardRules, BOARD_SIZE
+from prologRules.ia_helper import switch_player
+from prologRules.symmetry import canonical_state, transform_state
+from ai.ai_engine import AIEngine
+from ai.minmax_alphabeta import INF
+from ai.opening_book import DEFAULT_PATH, BOOK_VERSION
+from ai.transposition import encode_move
+from ai.zobrist import hash_state
+
+
+def score_moves(minmax, state, player, depth, margin):
+    """
+    Liste des (coup, score) à moins de `margin` du meilleur. Un seul fils est cherché
+    par classe de fils symétriques ; la fenêtre (meilleur - margin, INF) suffit pour
+    obtenir le score exact des coups retenus.
+    """
+    minmax.root_player = player
+    minmax.start_time = time.perf_counter()
+    minmax.time_limit = None
+    minmax.tt.new_search()
+    key = hash_state(state)
+
+    groups = {}
+    for mv, child, winner in minmax.m.expand(state, player):
+        groups.setdefault(canonical_state(child)[0], []).append((mv, child, winner))
+    scores = minmax.evaluator.evaluate_batch([g[0][1] for g in groups.values()], player)
+    ordered = [g for _, g in sorted(zip(scores, groups.values()), key=lambda x: x[0], reverse=True)]
+
+    opponent = switch_player(player)
+    best = -INF
+    scored = []
+    for group in ordered:
+        mv, _, winner = group[0]
+        if winner == player:
+            val = 10000
+        else:
+            minmax.board.reset(state, key)
+            minmax.board.make(player, mv)
+            val = -minmax._negamax(opponent, depth - 1, -INF, -(best - margin - 1))
+        best = max(best, val)
+        scored.extend((m, val) for m, _, _ in group)
+
+    return [(mv, val) for mv, val in scored if val >= best - margin]
+
+
+def build_book(plies, depth, margin):
+    engine = AIEngine(rules="bitboard", manager=BitboardRules(), workers=1)
+    # Les feuilles à 8 pions profitent de la table de finales si elle existe
+    engine.ensure_tablebase("deplacement")
+    minmax = engine.minmax
+    rules = engine.search_manager
+
+    positions = {}
+    frontier = {"e" * BOARD_SIZE: (['e'] * BOARD_SIZE, 'n')}
+    for ply in range(plies):
+        t0 = time.perf_counter()
+        next_frontier = {}
+        for key, (state, player) in frontier.items():
+            # `state` est déjà la forme canonique : les coups le sont aussi
+            moves = score_moves(minmax, state, player, depth, margin)
+            positions[f"{key}:{player}"] = [[encode_move(mv), val] for mv, val in moves]
+
+            for mv, child, winner in rules.expand(state, player):
+                if winner != 'none':
+                    continue
+                child_key, t = canonical_state(child)
+                if child_key not in next_frontier:
+                    next_frontier[child_key] = (transform_state(child, t), switch_player(player))
+
+        print(f"[Book] Demi-coup {ply} : {len(frontier)} positions ({time.perf_counter() - t0:.1f}s)")
+        frontier = next_frontier
+
+    return positions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bibliothèque d'ouvertures du Teeko")
+    parser.add_argument("--output", default=DEFAULT_PATH)
+    parser.add_argument("--plies", type=int, default=4, help="nombre de demi-coups couverts")
+    parser.add_argument("--depth", type=int, default=5, help="profondeur de recherche par position")
+    parser.add_argument("--margin", type=int, default=15,
+                        help="écart de score maximal avec le meilleur coup pour rester dans le livre")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    positions = build_book(args.plies, args.depth, args.margin)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"version": BOOK_VERSION, "depth": args.depth, "plies": args.plies, "margin": args.margin,
+                   "positions": positions}, f, separators=(",", ":"))
+    print(f"[Book] Écrit : {args.output} ({len(positions)} positions, {time.perf_counter() - t0:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Cache des évaluations statiques de l'alpha-beta.
+
+La table de transposition ne sert pas pour les feuilles revues d'une itération à
+l'autre (sa valeur dépend de la profondeur et de la fenêtre) : ce cache garde
+uniquement le score statique d'une position, vu du joueur racine. Il est indexé
+par la clé canonique de Zobrist (canonical_key), qui distingue déjà le joueur
+racine : les positions symétriques et aux couleurs échangées partagent une entrée,
+et le cache reste valable d'un coup à l'autre, quel que soit le joueur racine.
+Capacité fixe (slots indexés par la clé), remplacement systématique.
+"""
+
+
+class EvalCache:
+    def __init__(self, capacity=1 << 16):
+        # puissance de 2 : index = cle & mask
+        self.capacity = 1 << max(capacity - 1, 0).bit_length()
+        self.mask = self.capacity - 1
+        self.keys = [None] * self.capacity
+        self.values = [0] * self.capacity
+        self.used = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Score statique de la position ou None."""
+        index = key & self.mask
+        if self.keys[index] == key:
+            self.hits += 1
+            return self.values[index]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        index = key & self.mask
+        if self.keys[index] is None:
+            self.used += 1
+        self.keys[index] = key
+        self.values[index] = value
+
+    def clear(self):
+        self.keys = [None] * self.capacity
+        self.values = [0] * self.capacity
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "fill": self.used / self.capacity,
+        }
@@ -20,6 +20,114 @@ Score global = somme pondérée :
 """
 
 from prologRules.ia_helper import switch_player
+from prologRules.bitboard_rules import TeekoState
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# -------------------------------------------------------------
+# Poids et tables precalculees
+# -------------------------------------------------------------
+HEATMAP = (
+    5,  8, 12,  8,  5,
+    8, 15, 22, 15,  8,
+    12, 22, 30, 22, 12,
+    8, 15, 22, 15,  8,
+    5,  8, 12,  8,  5
+)
+
+GROUP_BONUS = 12     # par paire ordonnee de pions voisins du joueur
+GROUP_PENALTY = 10   # par paire ordonnee de pions voisins de l'adversaire
+MOBILITY_WEIGHT = 2
+
+
+#PATTERN_SCORE[a][c] : score d'une combinaison gagnante contenant a pions du joueur et
+#c pions de l'adversaire (alignements + menaces de score_threats reunis)
+def _pattern_score(a, c):
+    score = 0
+    if c == 0:
+        score += {3: 350 + 4, 2: 35 + 1}.get(a, 0)
+    if a == 0:
+        score -= {3: 420 + 6, 2: 45 + 2}.get(c, 0)
+    return score
+
+
+PATTERN_SCORE = tuple(tuple(_pattern_score(a, c) for c in range(5)) for a in range(5))
+
+
+def _neighbours(i):
+    x, y = i % 5, i // 5
+    return tuple(ny * 5 + nx
+                 for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                 if (dx or dy) and 0 <= (nx := x + dx) < 5 and 0 <= (ny := y + dy) < 5)
+
+
+NEIGHBOURS = tuple(_neighbours(i) for i in range(25))
+
+
+class EvaluationTables:
+    """
+    Tables construites une seule fois a partir des combinaisons gagnantes :
+    combinaisons en masques de bits, combinaisons contenant chaque case,
+    voisins de chaque case (liste et masque) et heatmap.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(tuple(p) for p in patterns)
+        self.bits = tuple(1 << i for i in range(25))
+        self.pattern_masks = tuple(sum(1 << i for i in p) for p in self.patterns)
+        self.square_patterns = tuple(
+            tuple(k for k, p in enumerate(self.patterns) if i in p) for i in range(25))
+        self.neighbours = NEIGHBOURS
+        self.neighbour_masks = tuple(sum(1 << j for j in nb) for nb in NEIGHBOURS)
+        self.heatmap = HEATMAP
+        self.pattern_score = PATTERN_SCORE
+        self._matrices = None
+
+    #masques des pions du joueur et de l'adversaire
+    def masks(self, state, player):
+        if isinstance(state, TeekoState):
+            return state.masks(player)
+        opponent = switch_player(player)
+        own = opp = 0
+        for i, v in enumerate(state):
+            if v == player:
+                own |= 1 << i
+            elif v == opponent:
+                opp |= 1 << i
+        return own, opp
+
+    #matrices numpy pour evaluate_batch (construites au premier appel)
+    def matrices(self):
+        if self._matrices is None:
+            # colonnes : combinaisons gagnantes | voisins | heatmap
+            k = len(self.patterns)
+            products = np.zeros((25, k + 26), dtype=np.float32)
+            for j, p in enumerate(self.patterns):
+                products[list(p), j] = 1
+            for i, nb in enumerate(self.neighbours):
+                products[i, [k + j for j in nb]] = 1
+            products[:, k + 25] = self.heatmap
+            self._matrices = (products, products[:, k:k + 25].copy(),
+                              np.array(self.pattern_score, dtype=np.int64))
+        return self._matrices
+
+
+#code des cases pour encode_states : 1 pour 'n', -1 pour 'b', 0 pour une case vide
+if np is not None:
+    _CELL_CODES = np.zeros(256, dtype=np.int8)
+    _CELL_CODES[ord('n')] = 1
+    _CELL_CODES[ord('b')] = -1
+
+
+#plateaux -> tableau (N, 25) int8
+def encode_states(states):
+    boards = "".join("".join(s) for s in states).encode("ascii")
+    return _CELL_CODES[np.frombuffer(boards, dtype=np.uint8)].reshape(-1, 25)
+
 
 class Evaluation:
     def __init__(self, manager):
@@ -28,107 +136,131 @@ class Evaluation:
 
         #positions gagnantes
         self.winning_patterns = self.m.get_winning_positions()
-    
-    def evaluate(self,state,player):
+        self.tables = EvaluationTables(self.winning_patterns)
+
+    #winner : gagnant deja connu (ex. fourni par expand) pour eviter une requete
+    def evaluate(self,state,player,winner=None):
+        t = self.tables
+        opponent = switch_player(player)
+
+        # --- 1) HEATMAP + masques en une passe ---
+        heat = HEATMAP
+        own = opp = 0
+        score = 0
+        own_sq = []
+        opp_sq = []
+        if isinstance(state, TeekoState):
+            own, opp = state.masks(player)
+            for i in range(25):
+                if own >> i & 1:
+                    own_sq.append(i)
+                    score += heat[i]
+                elif opp >> i & 1:
+                    opp_sq.append(i)
+                    score -= heat[i]
+        else:
+            for i, v in enumerate(state):
+                if v == player:
+                    own |= 1 << i
+                    own_sq.append(i)
+                    score += heat[i]
+                elif v == opponent:
+                    opp |= 1 << i
+                    opp_sq.append(i)
+                    score -= heat[i]
 
         #victoire
-        if self.m.winner(state)==player:
+        if winner is None:
+            winner = 'none'
+            for w in t.pattern_masks:
+                if own & w == w:
+                    winner = player
+                    break
+                if opp & w == w:
+                    winner = opponent
+                    break
+
+        if winner==player:
             return 10000
-        
-        if self.m.winner(state)==switch_player(player):
+
+        if winner==opponent:
             return -10000
-        
-        score=0
 
-        opponent = switch_player(player)
-        player_pos = self.m.get_player_positions(state, player)
-        opp_pos = self.m.get_player_positions(state, opponent)
+        # --- 2) GROUPING : paires ordonnees de pions voisins ---
+        nb = t.neighbour_masks
+        for i in own_sq:
+            score += GROUP_BONUS * (nb[i] & own).bit_count()
+        for i in opp_sq:
+            score -= GROUP_PENALTY * (nb[i] & opp).bit_count()
 
-        score = 0
+        # --- 3) ALIGNEMENTS + MENACES (attaque + défense) ---
+        ps = PATTERN_SCORE
+        for w in t.pattern_masks:
+            score += ps[(own & w).bit_count()][(opp & w).bit_count()]
 
-        # --- 1) HEATMAP (améliorée) ---
-        HEATMAP = [
-            5,  8, 12,  8,  5,
-            8, 15, 22, 15,  8,
-            12, 22, 30, 22, 12,
-            8, 15, 22, 15,  8,
-            5,  8, 12,  8,  5
-        ]
-        for p in player_pos:
-            score += HEATMAP[p]
-        for o in opp_pos:
-            score -= HEATMAP[o]
-
-        # --- 2) GROUPING (adjacency improved) ---
-        # Encourage IA à REGROUPER ses pions
-        # Pénalise adversaire groupé : équivalent défensif
-        def neighbors(i):
-            x, y = i % 5, i // 5
-            for dx in (-1,0,1):
-                for dy in (-1,0,1):
-                    if dx==0 and dy==0: continue
-                    nx, ny = x+dx, y+dy
-                    if 0 <= nx < 5 and 0 <= ny < 5:
-                        yield ny*5 + nx
-        
-        group_bonus = 0
-        for p in player_pos:
-            for nb in neighbors(p):
-                if nb in player_pos:
-                    group_bonus += 12   
-        score += group_bonus
-
-        group_penalty = 0
-        for o in opp_pos:
-            for nb in neighbors(o):
-                if nb in opp_pos:
-                    group_penalty += 10 
-        score -= group_penalty
-
-        # --- 3) ALIGNEMENTS / PATTERNS (attaque + défense) ---
-        for pattern in self.winning_patterns:
-            pcount = sum(1 for pos in pattern if pos in player_pos)
-            ocount = sum(1 for pos in pattern if pos in opp_pos)
-            empty = 4 - pcount - ocount
-
-            # Si j'ai 3 + 1 vide -> énorme chance de gagner
-            if pcount == 3 and empty == 1:
-                score += 350
-
-            # Si l'adversaire a 3 + 1 vide -> gros danger
-            if ocount == 3 and empty == 1:
-                score -= 420
-
-            # Alignement partiel (positif)
-            if pcount == 2 and empty == 2:
-                score += 35
-            if ocount == 2 and empty == 2:
-                score -= 45
-
-        # --- 4) THREATS 
-        score += self.score_threats(state, player)
-
-        # --- 5) MOBILITY 
-        if len(player_pos) == 4:
-            my_moves = len(self.m.get_legal_moves(state, player))
-            op_moves = len(self.m.get_legal_moves(state, opponent))
-            score += (my_moves - op_moves) * 2
+        # --- 4) MOBILITY : deplacements vers une case voisine vide ---
+        # (en phase de placement les deux joueurs ont autant de coups)
+        if len(own_sq) == 4 and len(opp_sq) == 4:
+            empty = ~(own | opp)
+            mobility = 0
+            for i in own_sq:
+                mobility += (nb[i] & empty).bit_count()
+            for i in opp_sq:
+                mobility -= (nb[i] & empty).bit_count()
+            score += MOBILITY_WEIGHT * mobility
 
         return score
-    
+
+    def evaluate_batch(self, states, player):
+        """
+        Scores (liste) de N plateaux en un appel, identiques a evaluate (gagnant deduit du plateau).
+        states : tableau (N, 25) int8 (voir encode_states) ou liste de plateaux.
+        Sans numpy, revient a une boucle sur evaluate.
+        """
+        if np is None:
+            return [self.evaluate(s, player) for s in states]
+        if not isinstance(states, np.ndarray):
+            states = encode_states(states)
+
+        products, adjacency, pattern_score = self.tables.matrices()
+        k = products.shape[1] - 26
+        n = len(states)
+        sign = 1 if player == 'n' else -1
+
+        # lignes 0..n-1 : pions du joueur, lignes n..2n-1 : pions de l'adversaire
+        x = np.empty((2 * n, 25), dtype=np.float32)
+        x[:n] = states == sign
+        x[n:] = states == -sign
+        r = x @ products
+
+        counts = r[:, :k].astype(np.intp)       # pions par combinaison gagnante
+        pairs = (r[:, k:k + 25] * x).sum(axis=1)
+        pieces = x.sum(axis=1)
+        own, opp = x[:n], x[n:]
+
+        score = r[:n, -1] - r[n:, -1]
+        score += GROUP_BONUS * pairs[:n] - GROUP_PENALTY * pairs[n:]
+        score += pattern_score[counts[:n], counts[n:]].sum(axis=1)
+
+        free = (1 - own - opp) @ adjacency      # cases voisines vides de chaque case
+        mobility = (own * free).sum(axis=1) - (opp * free).sum(axis=1)
+        score += MOBILITY_WEIGHT * mobility * ((pieces[:n] == 4) & (pieces[n:] == 4))
+
+        score = np.where((counts[n:] == 4).any(axis=1), -10000, score)
+        score = np.where((counts[:n] == 4).any(axis=1), 10000, score)
+        return score.astype(np.int64).tolist()
+
     def score_threats(self,state,player):
-        player_pos = set(self.m.get_player_positions(state, player))
-        opp_pos = set(self.m.get_player_positions(state, switch_player(player)))
+        own, opp = self.tables.masks(state, player)
 
         score = 0
 
-        for pattern in self.winning_patterns:
+        for w in self.tables.pattern_masks:
 
             # Compter les pions de chaque joueur dans ce pattern
-            player_count = sum(1 for pos in pattern if pos in player_pos)
-            opp_count = sum(1 for pos in pattern if pos in opp_pos)
+            player_count = (own & w).bit_count()
+            opp_count = (opp & w).bit_count()
 
-            
             # Menaces du joueur (attaque)
             if opp_count == 0:
                 if player_count == 2:
@@ -143,4 +275,124 @@ class Evaluation:
                 elif opp_count == 3:
                     score -= 6    # menace forte 
 
-        return score
\ No newline at end of file
+        return score
+
+
+# -------------------------------------------------------------
+# Evaluation incrementale (make / unmake)
+# -------------------------------------------------------------
+class IncrementalEvaluation:
+    """
+    Meme score que Evaluation.evaluate, mais tenu a jour coup par coup :
+    nombre de pions de chaque camp par combinaison gagnante, somme de la heatmap,
+    paires de pions voisins et total des combinaisons vu de chaque camp.
+    push() / pop() ne touchent que les combinaisons et voisins des cases modifiees.
+    """
+
+    def __init__(self, tables):
+        self.patterns = tables.patterns
+        self.square_patterns = tables.square_patterns
+        self.reset(['e'] * 25)
+
+    def reset(self, state):
+        n = len(self.patterns)
+        self.board = ['e'] * 25
+        self.counts = {'b': [0] * n, 'n': [0] * n}
+        self.heat = {'b': 0, 'n': 0}
+        self.pairs = {'b': 0, 'n': 0}
+        self.view = {'b': 0, 'n': 0}
+        self.squares = {'b': set(), 'n': set()}
+        self.history = []
+        for i, v in enumerate(state):
+            if v == 'b' or v == 'n':
+                self._add(v, i)
+
+    def _add(self, player, i):
+        opponent = switch_player(player)
+        board = self.board
+        self.pairs[player] += 2 * sum(1 for j in NEIGHBOURS[i] if board[j] == player)
+        self.heat[player] += HEATMAP[i]
+
+        own, opp = self.counts[player], self.counts[opponent]
+        delta_own = delta_opp = 0
+        for k in self.square_patterns[i]:
+            a, c = own[k], opp[k]
+            delta_own += PATTERN_SCORE[a + 1][c] - PATTERN_SCORE[a][c]
+            delta_opp += PATTERN_SCORE[c][a + 1] - PATTERN_SCORE[c][a]
+            own[k] = a + 1
+        self.view[player] += delta_own
+        self.view[opponent] += delta_opp
+
+        board[i] = player
+        self.squares[player].add(i)
+
+    def _remove(self, player, i):
+        opponent = switch_player(player)
+        board = self.board
+        board[i] = 'e'
+        self.squares[player].discard(i)
+
+        self.pairs[player] -= 2 * sum(1 for j in NEIGHBOURS[i] if board[j] == player)
+        self.heat[player] -= HEATMAP[i]
+
+        own, opp = self.counts[player], self.counts[opponent]
+        delta_own = delta_opp = 0
+        for k in self.square_patterns[i]:
+            a, c = own[k], opp[k]
+            delta_own += PATTERN_SCORE[a - 1][c] - PATTERN_SCORE[a][c]
+            delta_opp += PATTERN_SCORE[c][a - 1] - PATTERN_SCORE[c][a]
+            own[k] = a - 1
+        self.view[player] += delta_own
+        self.view[opponent] += delta_opp
+
+    #jouer un coup
+    def push(self, player, move):
+        if move[0] == "placement":
+            self._add(player, move[1])
+        else:
+            self._remove(player, move[1])
+            self._add(player, move[2])
+        self.history.append((player, move))
+
+    #annuler le dernier coup
+    def pop(self):
+        player, move = self.history.pop()
+        if move[0] == "placement":
+            self._remove(player, move[1])
+        else:
+            self._remove(player, move[2])
+            self._add(player, move[1])
+
+    def _mobility(self, player):
+        board = self.board
+        return sum(1 for i in self.squares[player] for j in NEIGHBOURS[i] if board[j] == 'e')
+
+    def winner(self):
+        if 4 in self.counts['b']:
+            return 'b'
+        if 4 in self.counts['n']:
+            return 'n'
+        return 'none'
+
+    def score(self, player, winner=None):
+        if winner is None:
+            winner = self.winner()
+        opponent = switch_player(player)
+        if winner == player:
+            return 10000
+        if winner == opponent:
+            return -10000
+
+        score = (self.heat[player] - self.heat[opponent]
+                 + GROUP_BONUS * self.pairs[player] - GROUP_PENALTY * self.pairs[opponent]
+                 + self.view[player])
+
+        # Mobilite : seulement en phase de deplacement (sinon les deux listes de placements sont egales)
+        if len(self.squares[player]) == 4 and len(self.squares[opponent]) == 4:
+            score += MOBILITY_WEIGHT * (self._mobility(player) - self._mobility(opponent))
+        return score
+
+    #score vu du joueur au trait (negamax) : les poids restent ceux de root_player, au signe pres
+    def relative_score(self, player, root_player, winner=None):
+        score = self.score(root_player, winner)
+        return score if player == root_player else -score
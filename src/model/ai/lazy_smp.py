@@ -0,0 +1,151 @@
+"""
+Lazy SMP : N processus auxiliaires cherchent la même racine que le processus
+principal, à des profondeurs décalées et avec des ordres de coups variés.
+
+Ils ne renvoient aucun coup : leur seul rôle est de remplir la table de transposition
+partagée (SharedTranspositionTable en mémoire partagée). L'approfondissement itératif
+du processus principal retrouve ensuite ces entrées (coupures, coup de hachage).
+Contrairement au découpage de la racine, tous les coeurs restent occupés même quand
+la racine n'a que quelques coups (phase de déplacement).
+Les helpers sont démarrés avant la première recherche (warm_up). Chaque recherche a un
+numéro, repris dans les messages de fin des helpers : une fin arrivée après l'abandon
+de sa recherche n'est pas comptée dans la suivante.
+"""
+import multiprocessing
+import queue
+import time
+
+from ai.zobrist import hash_state
+from ai.transposition import SharedTranspositionTable
+
+
+def _helper_main(index, jobs, done, stop_event, tt_name, engine_kwargs):
+    from ai.ai_engine import AIEngine
+
+    engine = AIEngine(**engine_kwargs)
+    minmax = engine.minmax
+    minmax.tt = SharedTranspositionTable(name=tt_name)
+    minmax.stop_event = stop_event
+    # Un helper sur deux mélange l'ordre des coups racine
+    minmax.root_shuffle = index % 2 == 1
+    # Table de finales ouverte avant d'être prêt : la première recherche n'en paie pas le coût
+    engine.ensure_tablebase("deplacement")
+    done.put(("ready", None, index, 0))
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+
+        search_id, state, player, max_depth, deadline, generation = job
+        engine.ensure_tablebase(engine.search_manager.get_phase(state))
+        minmax.tt.generation = generation
+        minmax.ordering.new_search()
+        minmax.root_player = player
+        minmax.start_time = time.perf_counter()
+        minmax.time_limit = max(deadline - time.time(), 1e-3) if deadline is not None else None
+        minmax.node_count = 0
+
+        key = hash_state(state)
+        # Profondeurs décalées : les helpers impairs commencent un cran plus loin
+        first = 1 + index % 2
+        for depth in range(first, max_depth + 2):
+            if minmax._timeout():
+                break
+            val, _ = minmax._alphabeta_root(state, player, depth, key, "none")
+            if val is None:
+                break
+
+        done.put(("done", search_id, index, minmax.node_count))
+
+    minmax.tt.close()
+
+
+class LazySMP:
+    def __init__(self, helpers, tt, **engine_kwargs):
+        # tt : SharedTranspositionTable du processus principal (les helpers s'y attachent)
+        self.helpers = helpers
+        self.tt = tt
+        # Les helpers n'ouvrent ni pool ni helpers à leur tour
+        self.engine_kwargs = dict(engine_kwargs, workers=1)
+
+        self.ctx = multiprocessing.get_context("spawn")
+        self.stop_event = self.ctx.Event()
+        self.done = self.ctx.Queue()
+        self.jobs = []
+        self.processes = []
+        self.running = 0
+        self.helper_nodes = 0
+        # Numéro de la recherche en cours (messages de fin des recherches précédentes ignorés)
+        self.search_id = 0
+
+    def _ensure_started(self):
+        if self.processes:
+            return
+        for i in range(self.helpers):
+            jobs = self.ctx.Queue()
+            process = self.ctx.Process(
+                target=_helper_main,
+                args=(i, jobs, self.done, self.stop_event, self.tt.name, self.engine_kwargs),
+                name=f"teeko-smp-{i}",
+                daemon=True,
+            )
+            process.start()
+            self.jobs.append(jobs)
+            self.processes.append(process)
+
+    #démarre les helpers et attend qu'ils soient prêts (import, AIEngine), hors du temps de recherche
+    def warm_up(self, timeout=60):
+        self._ensure_started()
+        end = time.time() + timeout
+        ready = 0
+        while ready < len(self.processes):
+            try:
+                kind, _, _, _ = self.done.get(timeout=max(end - time.time(), 0.01))
+            except queue.Empty:
+                break
+            if kind == "ready":
+                ready += 1
+
+    #lance les helpers sur la racine (state, player)
+    def start_search(self, state, player, max_depth, time_left):
+        self._ensure_started()
+        self.stop_event.clear()
+        self.search_id += 1
+        deadline = time.time() + time_left if time_left is not None else None
+        for jobs in self.jobs:
+            jobs.put((self.search_id, state, player, max_depth, deadline, self.tt.generation))
+        self.running = len(self.jobs)
+
+    #arrête les helpers et attend qu'ils rendent la main
+    def stop_search(self, timeout=2.0):
+        self.stop_event.set()
+        self.helper_nodes = 0
+        end = time.time() + timeout
+        while self.running:
+            try:
+                kind, search_id, _, nodes = self.done.get(timeout=max(end - time.time(), 0.01))
+            except queue.Empty:
+                break
+            # Helper prêt en retard, ou fin d'une recherche déjà abandonnée
+            if kind != "done" or search_id != self.search_id:
+                continue
+            self.helper_nodes += nodes
+            self.running -= 1
+        self.running = 0
+        return self.helper_nodes
+
+    def cancel(self):
+        self.stop_event.set()
+
+    def shutdown(self):
+        self.stop_event.set()
+        for jobs in self.jobs:
+            jobs.put(None)
+        for process in self.processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.terminate()
+        self.jobs = []
+        self.processes = []
+        self.tt.close()
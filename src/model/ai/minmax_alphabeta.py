@@ -1,14 +1,35 @@
 # AI/minmax_alphabeta.py
 import time
 import random
+import threading
 from prologRules.ia_helper import switch_player
+from prologRules.symmetry import INVERSE, transform_move
+from ai.zobrist import hash_state, update_key, canonical_key
+from ai.transposition import TranspositionTable, EXACT, LOWER, UPPER
+from ai.tablebase import WIN, LOSS
+from ai.evaluation import IncrementalEvaluation
+from ai.eval_cache import EvalCache
+from ai.move_ordering import MoveOrdering
+from ai.search_board import SearchBoard
+from prologRules.bitboard_rules import BitboardRules
 
 INF = 10**9
 
+# Score d'une position résolue par la table de finales : TB_SCORE - distance au mat
+TB_SCORE = 10000
+TB_DEPTH = 255  # profondeur stockée dans la TT : valeur exacte quelle que soit la profondeur
+
 class MinMaxAlphaBeta:
-    def __init__(self, manager, evaluator, engine, max_depth=4, time_limit=None, mode=None):
+    def __init__(self, manager, evaluator, engine, max_depth=4, time_limit=None, mode=None, tt=None,
+                 parallel=None, smp=None, tablebase=None, eval_cache=None, pvs=False, aspiration=0,
+                 quiescence=0, verbose=False):
         self.m = manager
         self.evaluator = evaluator
+        # Évaluation incrémentale synchronisée avec la descente (push avant l'appel récursif, pop après)
+        self.inc = IncrementalEvaluation(evaluator.tables)
+        # Plateau de recherche modifié sur place (make / unmake), sans copie par fils ;
+        # coups des noeuds internes générés par le manager si ce n'est pas le backend bitboard
+        self.board = SearchBoard(self.inc, None if isinstance(manager, BitboardRules) else manager)
         self.max_depth = max_depth
         self.engine = engine
         self.time_limit = time_limit
@@ -19,9 +40,41 @@ class MinMaxAlphaBeta:
         self.max_cycle_full_repeats = 4     # combien avant draw
         
         self.root_player = None
-        self.transpo = {} 
+        # Table de transposition bornée, conservée d'un coup à l'autre
+        self.tt = tt if tt is not None else TranspositionTable()
+        # Scores statiques déjà calculés (feuilles et ordonnancement), conservés d'un coup à l'autre
+        self.eval_cache = eval_cache if eval_cache is not None else EvalCache()
+        # Ordre des coups aux noeuds internes (killers, historique), sans évaluation complète
+        self.ordering = MoveOrdering(evaluator.tables)
         self.start_time = None
         self.node_count = 0
+        self.qnode_count = 0
+
+        # Recherche parallèle des coups racine (ParallelRootSearch) ou None
+        self.parallel = parallel
+
+        # Helpers Lazy SMP (LazySMP) partageant la table de transposition, ou None
+        self.smp = smp
+        # Ordre des coups racine mélangé (helpers Lazy SMP)
+        self.root_shuffle = False
+
+        # Table de finales (phase de déplacement) ou None
+        self.tablebase = tablebase
+
+        # PVS : premier fils en fenêtre complète, les suivants en fenêtre nulle (nouvelle recherche si besoin)
+        self.pvs = pvs
+        # Demi-largeur de la fenêtre d'aspiration autour du score précédent (0 : fenêtre complète)
+        self.aspiration = aspiration
+        # Quiescence : demi-coups forcés (gains, blocages) joués au-delà des feuilles (0 : désactivée)
+        self.quiescence = quiescence
+
+        # Arrêt demandé de l'extérieur (recherche asynchrone annulée)
+        self.stop_event = threading.Event()
+
+        # Statistiques de la dernière recherche
+        self.last_stats = {}
+        # Statistiques des tables affichées après chaque recherche (sinon seulement dans last_stats)
+        self.verbose = verbose
 
     # -------------------------------------------------------------
     # WRAPPER : Iterative deepening 
@@ -29,55 +82,125 @@ class MinMaxAlphaBeta:
     def compute(self, state, player):
         self.start_time = time.perf_counter()
         self.node_count = 0
+        self.qnode_count = 0
         self.root_player = player
-        self.transpo = {}
+        self.tt.new_search()
+        self.ordering.new_search()
         
         best_move = None
         best_score = -INF
+        reached_depth = 0
+        depth_scores = {}
+        retries = 0
+        self.last_stats = {"depth": 0, "score": None, "nodes": 0, "qnodes": 0}
 
         # Coup tactique : centre
         center = 12
         if state[center] == 'e' and ("placement", center) in self.m.get_legal_moves(state, player):
             return 99999, ("placement", center)
 
+        # Clé de Zobrist de la racine (mise à jour en O(1) ensuite)
+        key = hash_state(state)
+
+        # Détection de cycle : une fois par coup joué (pas à chaque profondeur)
+        cycle_status = self.detect_cycle(key)
+
+        # Position gagnée d'après la table de finales : coup direct, sans recherche
+        if self.tablebase is not None:
+            tb = self._tablebase_move(state, player)
+            if tb is not None:
+                self.last_stats = {"depth": 0, "score": tb[0], "nodes": 0}
+                return tb
+
+        # Lazy SMP : les helpers remplissent la table partagée pendant notre recherche
+        if self.smp is not None:
+            self.smp.start_search(state, player, self.max_depth, self.time_limit)
+
         # ID Deepening
-        for depth in range(1, self.max_depth + 1):
+        try:
+            for depth in range(1, self.max_depth + 1):
 
-            if self._timeout():
-                break
+                if self._timeout():
+                    break
 
-            val, move = self._alphabeta_root(state, player, depth)
+                depth_start = self.node_count
+                if self.aspiration and depth >= 3 and abs(depth_scores[depth - 2]) < 9000:
+                    # Fenêtre d'aspiration centrée sur le score de même parité (profondeur - 2) :
+                    # d'une profondeur à la suivante, le score oscille selon le camp qui joue en dernier.
+                    # En cas d'échec, seul le côté raté est ouvert avant de chercher à nouveau.
+                    center = depth_scores[depth - 2]
+                    lo, hi = center - self.aspiration, center + self.aspiration
+                    while True:
+                        val, move = self._alphabeta_root(state, player, depth, key, cycle_status, lo, hi)
+                        if val is None or move is None or lo < val < hi:
+                            break
+                        retries += 1
+                        if self.verbose:
+                            print(f"[ID] Aspiration ({lo}, {hi}) ratée : score={val}, nouvelle recherche")
+                        if val <= lo:
+                            lo = -INF
+                        else:
+                            hi = INF
+                else:
+                    val, move = self._alphabeta_root(state, player, depth, key, cycle_status)
+
+                if val is None or move is None:
+                    break
 
-            if val is None or move is None:
-                break
-            
-            best_move = move
-            best_score = val
+                best_move = move
+                best_score = val
+                reached_depth = depth
+                depth_scores[depth] = val
 
-            print(f"[ID] Profondeur={depth} | Score={best_score} | Best={best_move}")
+                print(f"[ID] Profondeur={depth} | Score={best_score} | Best={best_move} | Noeuds={self.node_count}"
+                      f" (+{self.node_count - depth_start}) | Quiescence={self.qnode_count}")
 
-            if best_score >= 9000:
-                break
+                if best_score >= 9000:
+                    break
+        finally:
+            helper_nodes = self.smp.stop_search() if self.smp is not None else 0
+
+        stats = self.tt.stats()
+        cache = self.eval_cache.stats()
+        self.last_stats = {"depth": reached_depth, "score": best_score, "nodes": self.node_count,
+                           "qnodes": self.qnode_count, "helper_nodes": helper_nodes,
+                           "aspiration_retries": retries, "tt": stats, "eval_cache": cache}
+
+        if self.verbose:
+            print(f"[TT] Remplissage={stats['fill']:.1%} | Hits={stats['hits']}/{stats['probes']}"
+                  f" | Remplacements={stats.get('replacements', 0)}")
+            print(f"[Eval] Cache : Remplissage={cache['fill']:.1%} | Hits={cache['hits']}/{cache['hits'] + cache['misses']}")
 
         return best_score, best_move
 
+    #scores statiques des fils : cache d'évaluation, les absents en un seul appel vectorisé
+    def _static_scores(self, children, child_keys, next_player):
+        cache = self.eval_cache
+        keys = [canonical_key(k, next_player, self.root_player)[0] for k in child_keys]
+        scores = [cache.get(k) for k in keys]
+        missing = [i for i, v in enumerate(scores) if v is None]
+        if missing:
+            values = self.evaluator.evaluate_batch([children[i][1] for i in missing], self.root_player)
+            for i, v in zip(missing, values):
+                scores[i] = v
+                cache.put(keys[i], v)
+        return scores
+
     # -------------------------------------------------------------
     # ALPHABETA RACINE
     # -------------------------------------------------------------
-    def _alphabeta_root(self, state, player, depth):
-        alpha = -INF
-        beta = INF
+    def _alphabeta_root(self, state, player, depth, key, cycle_status, alpha=-INF, beta=INF):
+        alpha_orig = alpha
         scored_moves = []
 
-        moves = self.m.get_legal_moves(state, player)
-        if not moves:
+        # Une seule requete : coups, etats fils et gagnants
+        children = self.m.expand(state, player)
+        if not children:
             return -INF, None
 
         # ====================
         # 1. DÉTECTION CYCLE 
         # ======================
-        cycle_status = self.detect_cycle(state)
-
         # Match nul uniquement en IAvsIA
         if cycle_status == "full" and self.mode == "IAvsIA":
             print("[CYCLE] Match nul détecté (IAvsIA).")
@@ -86,19 +209,33 @@ class MinMaxAlphaBeta:
         # ======================================================
         # 2. MOVE ORDERING 
         # ======================================================
-        ordered = []
-        for mv in moves:
-            sim = self.engine.simulate_move(state, player, mv)
-
+        self.board.reset(state, key)
+        for mv, sim, winner in children:
             # Coup gagnant immédiat -> joue direct
-            if self.m.winner(sim) == player:
+            if winner == player:
                 return 100000, mv
 
-            score = self.evaluator.evaluate(sim, self.root_player)
-            ordered.append((score, mv))
+        # Scores statiques de tous les fils (cache, puis un appel vectorisé)
+        scores = self._static_scores(children, [update_key(key, player, mv) for mv, _, _ in children],
+                                     switch_player(player))
+        ordered = [(score, mv, sim, winner) for score, (mv, sim, winner) in zip(scores, children)]
 
         ordered.sort(key=lambda x: x[0], reverse=True)
-        ordered_moves = [mv for _, mv in ordered]
+        ordered_moves = [mv for _, mv, _, _ in ordered]
+        expansion = {mv: (sim, winner) for _, mv, sim, winner in ordered}
+
+        # Coup de la table (itération précédente) en premier, ramené depuis la forme canonique
+        tt_key, sym = canonical_key(key, player, self.root_player)
+        entry = self.tt.probe(tt_key)
+        if entry is not None and entry[3] is not None:
+            hash_move = transform_move(entry[3], INVERSE[sym])
+            if hash_move in expansion:
+                ordered_moves.remove(hash_move)
+                ordered_moves.insert(0, hash_move)
+
+        # Helper Lazy SMP : ordre différent du processus principal
+        if self.root_shuffle:
+            random.shuffle(ordered_moves)
 
         # ================================
         # 3. PHASE DE PLACEMENT -> RANDOM
@@ -117,8 +254,15 @@ class MinMaxAlphaBeta:
             # IA vs IA -> random safe seulement si aucun coup gagnant immédiat
             if self.mode == "IAvsIA":
                 print("[CYCLE] Cycle détecté, random safe activé (IAvsIA)")
-                best = self.safe_random_move(state, player, ordered_moves)
-                return self.evaluator.evaluate(self.engine.simulate_move(state, player, best), self.root_player), best
+                candidates = ordered_moves
+                if self.tablebase is not None:
+                    # Jamais de coup perdant d'après la table de finales
+                    opponent = switch_player(player)
+                    candidates = [mv for mv in ordered_moves
+                                  if (self._probe_tablebase(expansion[mv][0], opponent) or 0) < TB_SCORE // 2
+                                  ] or ordered_moves
+                best = self.safe_random_move(state, player, candidates)
+                return self.evaluator.evaluate(expansion[best][0], self.root_player), best
 
             # PvsIA -> réordonne simplement les coups cycliques à la fin
             else:
@@ -126,8 +270,7 @@ class MinMaxAlphaBeta:
                 cyclic = []
 
                 for mv in ordered_moves:
-                    sim = self.engine.simulate_move(state, player, mv)
-                    if tuple(sim) in self.state_history:
+                    if update_key(key, player, mv) in self.state_history:
                         cyclic.append(mv)
                     else:
                         non_cyclic.append(mv)
@@ -141,16 +284,26 @@ class MinMaxAlphaBeta:
         best_score = -INF
         best_move = None
 
-        for mv in ordered_moves:
-            child = self.engine.simulate_move(state, player, mv)
-            next_player = switch_player(player)
-
-            maximizing = (next_player == self.root_player)
-
-            val = self._alphabeta(child, next_player, depth-1, alpha, beta, maximizing)
+        # Parallèle : seul le premier coup est cherché ici, il fixe la borne des autres
+        split = self.parallel is not None and depth >= 2 and len(ordered_moves) > 1
+        serial_moves = ordered_moves[:1] if split else ordered_moves
+
+        next_player = switch_player(player)
+        board = self.board
+        for i, mv in enumerate(serial_moves):
+            board.make(player, mv)
+            if self.pvs and i > 0:
+                # Fenêtre nulle : le coup bat-il le meilleur ? Sinon inutile de connaître sa valeur
+                result = self._negamax(next_player, depth-1, -alpha - 1, -alpha)
+                if result is not None and alpha < -result < beta:
+                    result = self._negamax(next_player, depth-1, -beta, -alpha)
+            else:
+                result = self._negamax(next_player, depth-1, -beta, -alpha)
+            board.unmake()
 
-            if val is None:
+            if result is None:
                 return None, None
+            val = -result
 
             scored_moves.append((val, mv))
 
@@ -159,118 +312,275 @@ class MinMaxAlphaBeta:
                 best_move = mv
 
             alpha = max(alpha, val)
+            # Fail-high (fenêtre d'aspiration) : la profondeur sera recherchée à nouveau
+            if alpha >= beta:
+                split = False
+                break
+
+        if split:
+            time_left = self.time_limit - (time.perf_counter() - self.start_time) if self.time_limit else None
+            results, nodes = self.parallel.search(state, player, ordered_moves[1:], depth, alpha, beta,
+                                                  time_left, self.root_player)
+            self.node_count += nodes
+            if results is None:
+                return None, None
+
+            # Fusion dans l'ordre des coups (même départage qu'en séquentiel) ;
+            # après une coupure beta, les coups abandonnés n'ont pas de valeur
+            for mv in ordered_moves[1:]:
+                if mv not in results:
+                    continue
+                val = results[mv]
+                scored_moves.append((val, mv))
+                if val > best_score:
+                    best_score = val
+                    best_move = mv
+
+        if best_move is not None:
+            self.tt.store(tt_key, best_score, depth, self._bound(best_score, alpha_orig, beta),
+                          transform_move(best_move, sym))
 
         return best_score, best_move
 
 
 
     # -------------------------------------------------------------
-    # RECURSIVE ALPHA-BETA
+    # NEGAMAX (ALPHA-BETA RÉCURSIF)
     # -------------------------------------------------------------
-    def _alphabeta(self, state, player, depth, alpha, beta, maximizing):
-
+    def _negamax(self, player, depth, alpha, beta, ply=1):
+        """
+        Valeur de la position de self.board du point de vue de `player` (joueur au trait) :
+        la valeur d'un fils est l'opposé de celle renvoyée pour l'adversaire, fenêtre
+        (-beta, -alpha). Les feuilles gardent l'évaluation de root_player (poids
+        asymétriques), au signe près. `ply` : distance à la racine (killers).
+        """
         if self._timeout():
             return None
 
         self.node_count += 1
+        board = self.board
 
         # -------------------------------------------------
-        # clé de transposition 
-        # -------------------------------------------------
-        key = (tuple(state), depth, player, maximizing, self.root_player)
+        # clé de transposition : Zobrist canonique (symétries, couleurs) + trait == racine
+        # (les valeurs stockées sont celles du joueur au trait)
         # -------------------------------------------------
-        if key in self.transpo:
-            return self.transpo[key]
+        tt_key, sym = canonical_key(board.key, player, self.root_player)
+        hash_move = None
+
+        entry = self.tt.probe(tt_key)
+        if entry is not None:
+            tt_value, tt_depth, tt_flag, hash_move = entry
+            if hash_move is not None:
+                hash_move = transform_move(hash_move, INVERSE[sym])
+            if tt_depth >= depth:
+                if tt_flag == EXACT:
+                    return tt_value
+                if tt_flag == LOWER:
+                    alpha = max(alpha, tt_value)
+                else:
+                    beta = min(beta, tt_value)
+                if alpha >= beta:
+                    return tt_value
 
-        # Terminal node
-        if depth == 0 or self.m.is_terminal(state):
-            val = self.evaluator.evaluate(state, self.root_player)
-            self.transpo[key] = val
-            return val
+        # Fenêtre de référence pour la nature de la borne stockée : celle resserrée par la table
+        alpha_orig, beta_orig = alpha, beta
 
-        moves = self.m.get_legal_moves(state, player)
-        if not moves:
-            val = -INF if maximizing else INF
-            self.transpo[key] = val
+        # Terminal node (gagnant tenu à jour par make)
+        winner = board.winner
+        if winner != 'none':
+            val = self.inc.relative_score(player, self.root_player, winner)
+            self.tt.store(tt_key, val, depth, EXACT, None)
             return val
 
-        # Move ordering
-        ordered = []
-        for mv in moves:
-            sim = self.engine.simulate_move(state, player, mv)
-            s = self.evaluator.evaluate(sim, self.root_player)
-            ordered.append((s, mv))
-
-        ordered.sort(key=lambda x: x[0], reverse=maximizing)
-        ordered_moves = [mv for _, mv in ordered]
-
-        # ------------------------
-        # MAX PLAYER (root_player)
-        # ------------------------
-        if maximizing:
-            value = -INF
-            for mv in ordered_moves:
-                child = self.engine.simulate_move(state, player, mv)
-
-                next_player = switch_player(player)
-                next_max = (next_player == self.root_player)   # FIX 3
-                result = self._alphabeta(child, next_player, depth-1, alpha, beta, next_max)
-
-                if result is None:
+        opponent = switch_player(player)
+        own, opp = board.masks[player], board.masks[opponent]
+
+        # Table de finales : gain ou perte exacts (les nuls restent à l'heuristique)
+        if self.tablebase is not None and (own | opp).bit_count() == 8:
+            result = self.tablebase.probe_masks(own, opp)
+            if result is not None and result[0] in (WIN, LOSS):
+                val = result[0] * (TB_SCORE - result[1])
+                self.tt.store(tt_key, val, TB_DEPTH, EXACT, None)
+                return val
+
+        if depth == 0:
+            if self.quiescence:
+                # Gains et blocages prolongés jusqu'à une position calme
+                value = self._quiesce(player, alpha, beta, 0, tt_key)
+                if value is None:
                     return None
+                self.tt.store(tt_key, value, depth, self._bound(value, alpha_orig, beta_orig), None)
+                return value
+            val = self._static_value(player, tt_key)
+            self.tt.store(tt_key, val, depth, EXACT, None)
+            return val
 
-                value = max(value, result)
-                alpha = max(alpha, value)
-                if alpha >= beta:
-                    break
+        moves = board.legal_moves(player)
+        if not moves:
+            self.tt.store(tt_key, -INF, depth, EXACT, None)
+            return -INF
 
-            self.transpo[key] = value
-            return value
+        # Move ordering : coup de la table d'abord, puis gains, blocages, killers, historique
+        # (pas d'évaluation complète aux noeuds internes)
+        ordered = self.ordering.order(moves, own, opp, ply)
 
-        # ------------------------
-        # MIN PLAYER (adversaire)
-        # ------------------------
-        else:
-            value = INF
-            for mv in ordered_moves:
-                child = self.engine.simulate_move(state, player, mv)
+        if hash_move is not None and hash_move in ordered:
+            ordered.remove(hash_move)
+            ordered.insert(0, hash_move)
 
-                next_player = switch_player(player)
-                next_max = (next_player == self.root_player)   # FIX 4
-                result = self._alphabeta(child, next_player, depth-1, alpha, beta, next_max)
+        value = -INF
+        best_move = None
 
-                if result is None:
-                    return None
+        for i, mv in enumerate(ordered):
+            board.make(player, mv)
+            if self.pvs and i > 0:
+                # PVS : fenêtre nulle, recherche complète seulement si le coup bat alpha
+                result = self._negamax(opponent, depth-1, -alpha - 1, -alpha, ply + 1)
+                if result is not None and alpha < -result < beta:
+                    result = self._negamax(opponent, depth-1, -beta, -alpha, ply + 1)
+            else:
+                result = self._negamax(opponent, depth-1, -beta, -alpha, ply + 1)
+            board.unmake()
 
-                value = min(value, result)
-                beta = min(beta, value)
-                if beta <= alpha:
-                    break
+            if result is None:
+                return None
+
+            result = -result
+            if result > value:
+                value = result
+                best_move = mv
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        self.ordering.cutoff(mv, ply, depth)
+                        break
+
+        self.tt.store(tt_key, value, depth, self._bound(value, alpha_orig, beta_orig),
+                      transform_move(best_move, sym) if best_move else None)
+        return value
+
+    #nature de la borne par rapport à la fenêtre d'origine
+    @staticmethod
+    def _bound(value, alpha_orig, beta_orig):
+        if value <= alpha_orig:
+            return UPPER
+        if value >= beta_orig:
+            return LOWER
+        return EXACT
+
+    #score statique du point de vue de `player` (cache : score vu de root_player)
+    def _static_value(self, player, tt_key):
+        val = self.eval_cache.get(tt_key)
+        if val is None:
+            val = self.inc.score(self.root_player, 'none')
+            self.eval_cache.put(tt_key, val)
+        return val if player == self.root_player else -val
 
-            self.transpo[key] = value
-            return value
+    # -------------------------------------------------------------
+    # QUIESCENCE
+    # -------------------------------------------------------------
+    def _quiesce(self, player, alpha, beta, ply, tt_key=None):
+        """
+        Prolonge une feuille tant qu'un coup est forcé, sans élargir la recherche :
+          - gain en un coup du joueur au trait : position gagnée ;
+          - case gagnante adverse : seuls les blocages sont joués (deux cases : perdu) ;
+          - sinon (position calme) ou au-delà de self.quiescence demi-coups : score statique.
+        Pas de table de transposition ni d'ordonnancement (killers) sous les feuilles.
+        """
+        if ply:
+            if self._timeout():
+                return None
+            self.node_count += 1
+            self.qnode_count += 1
+
+        board = self.board
+        winner = board.winner
+        if winner != 'none':
+            return self.inc.relative_score(player, self.root_player, winner)
+        if board.winning_squares(player):
+            return self.inc.relative_score(player, self.root_player, player)
+
+        # Cases gagnantes de l'adversaire au coup suivant (il peut changer de phase entre-temps)
+        opponent = switch_player(player)
+        threats = board.winning_squares(opponent, board.pieces() + 1 < 8)
+        if not threats or ply >= self.quiescence:
+            if tt_key is None:
+                tt_key = canonical_key(board.key, player, self.root_player)[0]
+            return self._static_value(player, tt_key)
+        # Deux cases gagnantes : un seul blocage possible
+        if threats & (threats - 1):
+            return self.inc.relative_score(player, self.root_player, opponent)
+
+        # Seuls les coups arrivant sur la case menacée (aucun : perdu)
+        value = self.inc.relative_score(player, self.root_player, opponent)
+        for mv in board.legal_moves(player):
+            if not threats >> mv[-1] & 1:
+                continue
+            board.make(player, mv)
+            result = self._quiesce(opponent, -beta, -alpha, ply + 1)
+            board.unmake()
+
+            if result is None:
+                return None
+
+            result = -result
+            if result > value:
+                value = result
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+        return value
+
+    # -------------------------------------------------------------
+    # TABLE DE FINALES
+    # -------------------------------------------------------------
+    def _probe_tablebase(self, state, player):
+        """Score (point de vue du joueur au trait) d'une position gagnée ou perdue, sinon None."""
+        result = self.tablebase.probe(state, player)
+        if result is None or result[0] not in (WIN, LOSS):
+            return None
+        return result[0] * (TB_SCORE - result[1])
+
+    def _tablebase_move(self, state, player):
+        """(score, coup) qui conserve le gain au plus court, ou None si la racine n'est pas gagnée."""
+        result = self.tablebase.probe(state, player)
+        if result is None or result[0] != WIN:
+            return None
+        dtm = result[1]
+        opponent = switch_player(player)
+        for mv, child, winner in self.m.expand(state, player):
+            if winner == player:
+                return TB_SCORE - 1, mv
+            reply = self.tablebase.probe(child, opponent)
+            if reply is not None and reply[0] == LOSS and reply[1] == dtm - 1:
+                print(f"[TB] Gain en {dtm} demi-coups : {mv}")
+                return TB_SCORE - dtm, mv
+        return None
 
     def _timeout(self):
+        if self.stop_event.is_set():
+            return True
         return (self.time_limit and (time.perf_counter() - self.start_time) > self.time_limit)
     
     # ------------------------
     # Détecttion des boucles dans le jeu
     # ------------------------
-    def detect_cycle(self, state):
+    def detect_cycle(self, key):
         """
+        key : clé de Zobrist du plateau courant
         Retourne :
             - "none"  -> pas de cycle
             - "minor" -> cycle léger détecté (on déclenche un random contrôlé)
             - "full"  -> cycle trop long -> match nul (IA vs IA uniquement)
         """
-        s = tuple(state)
-        self.state_history.append(s)
+        self.state_history.append(key)
 
         # On ne garde que les 12 derniers
         if len(self.state_history) > 12:
             self.state_history.pop(0)
 
-        repeats = self.state_history.count(s)
+        repeats = self.state_history.count(key)
 
         if repeats >= self.max_cycle_full_repeats:
             return "full"
@@ -290,53 +600,42 @@ class MinMaxAlphaBeta:
         et donner la priorité aux coups de blocage immédiats.
         """
         safe_moves = []
+        board = self.board
+        board.reset(state)
+        opponent = switch_player(player)
 
         # 1. DÉTECTION DES MENACES DE L'ADVERSAIRE (Étape préliminaire)
         threat_moves = []
-        current_opponent_moves = self.m.get_legal_moves(state, switch_player(player))
-        for cm in current_opponent_moves:
-            sim_threat = self.engine.simulate_move(state, switch_player(player), cm)
-            if self.m.winner(sim_threat) == switch_player(player):
+        for cm in board.legal_moves(opponent):
+            board.make(opponent, cm)
+            if board.winner == opponent:
                 threat_moves.append(cm)
+            board.unmake()
                 
         # 2. ANALYSE DES COUPS CANDIDATS
         # On mélange les coups au début pour que le premier coup de blocage trouvé soit aléatoire
         random.shuffle(moves) 
         
         for mv in moves:
-            sim = self.engine.simulate_move(state, player, mv)
+            board.make(player, mv)
 
-            # A. FILTRE NÉGATIF 1: Éviter la défaite immédiate
-            if self.m.winner(sim) == switch_player(player):
-                continue
-
-            # B. FILTRE NÉGATIF 2: Éviter la double menace (Fourchette)
+            # A. FILTRE NÉGATIF : Éviter la double menace (Fourchette)
             danger_count = 0
-            next_moves = self.m.get_legal_moves(sim, switch_player(player))
-            for nm in next_moves:
-                sim2 = self.engine.simulate_move(sim, switch_player(player), nm)
-                if self.m.winner(sim2) == switch_player(player):
+            for nm in board.legal_moves(opponent):
+                board.make(opponent, nm)
+                if board.winner == opponent:
                     danger_count += 1
+                board.unmake()
+            board.unmake()
             
             if danger_count >= 2:
                 continue
                 
-            # C. FILTRE POSITIF (Priorité de la Défense)
-            if threat_moves:
-                # Vérifier si ce coup (mv) élimine toutes les menaces
-                blocks_all_threats = True
-                next_opponent_moves = self.m.get_legal_moves(sim, switch_player(player))
-                
-                for nom in next_opponent_moves:
-                    sim_after_block = self.engine.simulate_move(sim, switch_player(player), nom)
-                    # Si l'adversaire peut encore gagner après mon coup, le blocage a échoué.
-                    if self.m.winner(sim_after_block) == switch_player(player):
-                        blocks_all_threats = False 
-                        break
-
-                if blocks_all_threats:
-                    # C'est un coup de blocage réussi -> PRIORITY RETURN
-                    return mv 
+            # B. FILTRE POSITIF (Priorité de la Défense)
+            # Si l'adversaire ne peut plus gagner après mon coup, toutes les menaces sont bloquées
+            if threat_moves and danger_count == 0:
+                # C'est un coup de blocage réussi -> PRIORITY RETURN
+                return mv 
 
             # Si le coup passe tous les filtres sans être un blocage prioritaire, il est sûr
             safe_moves.append(mv)
@@ -47,7 +47,7 @@ class MinMaxOp:
             best_score = -999999
 
             for move in legal_moves:
-                new_state = self.engine.simulate_move(state, player, move)
+                new_state = self.m.apply_move(state, player, move)
                 score, _ = self.minmax(new_state, switch_player(player), depth - 1, False)
 
                 if score > best_score:
@@ -62,7 +62,7 @@ class MinMaxOp:
             best_score = 999999
 
             for move in legal_moves:
-                new_state = self.engine.simulate_move(state, player, move)
+                new_state = self.m.apply_move(state, player, move)
                 score, _ = self.minmax(new_state, switch_player(player), depth - 1, True)
 
                 if score < best_score:
@@ -0,0 +1,91 @@
+"""
+Ordonnancement des coups aux noeuds internes de l'alpha-beta.
+
+Trier les fils avec l'évaluation complète coûte presque un demi-coup de recherche
+de plus : ici l'ordre ne dépend que de tests bon marché, par priorité décroissante
+  - coup de la table de transposition (placé en tête par l'appelant) ;
+  - coup gagnant immédiat (combinaison à 3 pions complétée, masques de bits) ;
+  - blocage : le coup occupe la case libre d'une combinaison où l'adversaire a
+    3 pions (masques de bits des combinaisons gagnantes) ;
+  - coups killer : deux derniers coups ayant provoqué une coupure à la même distance
+    de la racine (ply), d'une itération de l'approfondissement à l'autre ;
+  - heuristique de l'historique : bonus depth² par coupure, indexé par (départ, arrivée),
+    départagé par la heatmap de la case d'arrivée. La table est divisée par 2 dès
+    qu'une entrée dépasse HISTORY_MAX : elle reste sous les blocages et les killers,
+    et un vieux coup ne masque pas indéfiniment la heatmap.
+L'évaluation complète n'est plus faite qu'aux feuilles (et pour trier la racine).
+"""
+from ai.transposition import MOVES_BY_CODE, encode_move
+from ai.evaluation import HEATMAP
+
+WIN_SCORE = 3 << 24
+BLOCK_SCORE = 2 << 24
+KILLER_SCORE = 1 << 24   # + 1 pour le killer le plus récent
+MAX_PLY = 64
+HISTORY_MAX = 1 << 12
+
+
+class MoveOrdering:
+    def __init__(self, tables):
+        self.pattern_masks = tables.pattern_masks
+        # killers[ply] : deux coups, le plus récent en premier
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        # history[code du coup] (codage de transposition.encode_move)
+        self.history = [0] * len(MOVES_BY_CODE)
+
+    #nouveau coup a jouer : killers oublies, historique divise par 2
+    def new_search(self):
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [h >> 1 for h in self.history]
+
+    def threats(self, own, opp):
+        """
+        (gains, blocages) : combinaisons a 3 pions du joueur completables, indexees par
+        leur case libre, et masque des cases qui completeraient une combinaison adverse.
+        """
+        wins = {}
+        blocks = 0
+        for w in self.pattern_masks:
+            if not opp & w:
+                if (own & w).bit_count() == 3:
+                    wins.setdefault((w & ~own).bit_length() - 1, []).append(w)
+            elif not own & w and (opp & w).bit_count() == 3:
+                blocks |= w & ~opp
+        return wins, blocks
+
+    def order(self, moves, own, opp, ply):
+        """Coups du joueur `own` tries du plus prometteur au moins prometteur."""
+        wins, blocks = self.threats(own, opp)
+        first, second = self.killers[ply]
+        history = self.history
+
+        scored = []
+        for mv in moves:
+            to = mv[-1]
+            # gain : le pion arrive complete une combinaison sans venir de celle-ci
+            if to in wins and (mv[0] == "placement" or any(not w >> mv[1] & 1 for w in wins[to])):
+                s = WIN_SCORE
+            elif blocks >> to & 1:
+                s = BLOCK_SCORE
+            elif mv == first:
+                s = KILLER_SCORE + 1
+            elif mv == second:
+                s = KILLER_SCORE
+            else:
+                # a historique egal : case d'arrivee la plus centrale
+                s = history[encode_move(mv)] + HEATMAP[to]
+            scored.append((s, mv))
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return [mv for _, mv in scored]
+
+    #coup ayant provoque une coupure beta a `ply` de la racine, `depth` demi-coups restants
+    def cutoff(self, move, ply, depth):
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        code = encode_move(move)
+        self.history[code] += depth * depth
+        if self.history[code] > HISTORY_MAX:
+            self.history = [h >> 1 for h in self.history]
@@ -0,0 +1,70 @@
+"""
+Bibliothèque d'ouvertures pour la phase de placement.
+
+Le fichier (JSON, produit hors ligne par book_builder.py) associe à chaque position
+canonique (forme symétrique minimale du plateau + joueur au trait) la liste des coups
+jugés proches du meilleur par une recherche profonde, avec leur score :
+    {"version": 1, "depth": D, "plies": N, "margin": M,
+     "positions": {"eennb...:n": [[code du coup, score], ...], ...}}
+Les coups sont stockés dans le repère canonique (codage de transposition.encode_move)
+et ramenés dans le repère du plateau réel au moment de la consultation.
+"""
+import json
+import os
+import random
+
+from prologRules.symmetry import INVERSE, canonical_state, transform_move
+from ai.transposition import MOVES_BY_CODE
+
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "assets", "teeko_book.json")
+
+BOOK_VERSION = 1
+
+
+#clé d'une position : plateau canonique + joueur au trait
+def book_key(state, player):
+    key, t = canonical_state(state)
+    return f"{key}:{player}", t
+
+
+class OpeningBook:
+    def __init__(self, path=DEFAULT_PATH, rng=None):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != BOOK_VERSION:
+            raise ValueError(f"Version de bibliothèque inconnue : {path}")
+
+        self.positions = data["positions"]
+        self.depth = data.get("depth")
+        self.margin = data.get("margin", 0)
+        self.rng = rng if rng is not None else random.Random()
+        self.hits = 0
+        print(f"[Book] {path} chargée ({len(self.positions)} positions, profondeur {self.depth})")
+
+    #charge la bibliothèque si le fichier existe, sinon None
+    @classmethod
+    def open_default(cls, path=DEFAULT_PATH):
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[Book] Ignorée : {e}")
+            return None
+
+    def lookup(self, state, player):
+        """Coup de la bibliothèque (tirage pondéré parmi les coups proches du meilleur) ou None."""
+        key, t = book_key(state, player)
+        entries = self.positions.get(key)
+        if not entries:
+            return None
+
+        # Poids linéaire : le meilleur coup pèse margin + 1, un coup à la limite pèse 1
+        best = max(score for _, score in entries)
+        weights = [self.margin + 1 - (best - score) for _, score in entries]
+        code, _ = self.rng.choices(entries, weights=[max(w, 1) for w in weights])[0]
+
+        self.hits += 1
+        return transform_move(MOVES_BY_CODE[code], INVERSE[t])
@@ -0,0 +1,155 @@
+"""
+Recherche parallèle à la racine (root splitting).
+
+Le premier coup de la racine est cherché normalement pour fixer une borne alpha ;
+les coups restants sont répartis sur un pool de processus. Chaque worker garde son
+propre AIEngine (règles, évaluation, table de transposition) d'une recherche à l'autre.
+L'alpha partagé est publié dans une mémoire commune dès qu'un worker l'améliore, et
+chaque nouveau coup racine part de la meilleure borne connue. Le beta de la racine
+(fenêtre d'aspiration) est transmis aux workers : dès qu'un coup le dépasse, les
+coups restants sont abandonnés.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from prologRules.ia_helper import switch_player
+
+INF = 10**9
+# Attente maximale des workers après un dépassement de temps (secondes)
+STOP_GRACE = 0.2
+
+# État propre à chaque processus du pool
+_engine = None
+_shared_alpha = None
+
+
+def _init_worker(engine_kwargs, shared_alpha, stop_event):
+    global _engine, _shared_alpha
+    from ai.ai_engine import AIEngine
+
+    _engine = AIEngine(**engine_kwargs)
+    _engine.minmax.stop_event = stop_event
+    _shared_alpha = shared_alpha
+
+
+#tâche vide : le worker est démarré et initialisé
+def _worker_pid():
+    time.sleep(0.05)
+    return os.getpid()
+
+
+#cherche un coup racine avec la fenêtre (alpha partagé, beta)
+def _search_root_move(state, player, move, depth, deadline, root_player, beta):
+    minmax = _engine.minmax
+    _engine.ensure_tablebase(_engine.search_manager.get_phase(state))
+    minmax.start_time = time.perf_counter()
+    minmax.time_limit = max(deadline - time.time(), 1e-3) if deadline is not None else None
+    minmax.root_player = root_player
+    minmax.node_count = 0
+
+    # alpha déjà au-delà de beta : coupure trouvée par un autre worker, fenêtre minimale
+    alpha = min(_shared_alpha.value, beta - 1)
+    minmax.board.reset(state)
+    minmax.board.make(player, move)
+    val = minmax._negamax(switch_player(player), depth - 1, -beta, -alpha)
+    if val is not None:
+        val = -val
+
+    if val is not None:
+        with _shared_alpha.get_lock():
+            if val > _shared_alpha.value:
+                _shared_alpha.value = val
+
+    return move, val, minmax.node_count
+
+
+class ParallelRootSearch:
+    def __init__(self, workers, **engine_kwargs):
+        self.workers = workers
+        # Les workers n'ouvrent pas eux-mêmes de pool
+        self.engine_kwargs = dict(engine_kwargs, workers=1)
+
+        self.ctx = multiprocessing.get_context("spawn")
+        self.shared_alpha = self.ctx.Value('q', -INF)
+        self.stop_event = self.ctx.Event()
+        self.pool = None
+
+    def _ensure_pool(self):
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self.ctx,
+                initializer=_init_worker,
+                initargs=(self.engine_kwargs, self.shared_alpha, self.stop_event),
+            )
+
+    #démarre et initialise tous les workers hors du temps de recherche (import, AIEngine)
+    def warm_up(self, timeout=60):
+        self._ensure_pool()
+        deadline = time.time() + timeout
+        ready = set()
+        while len(ready) < self.workers and time.time() < deadline:
+            futures = [self.pool.submit(_worker_pid) for _ in range(self.workers)]
+            done, _ = wait(futures, timeout=max(deadline - time.time(), 0))
+            ready.update(f.result() for f in done)
+
+    def search(self, state, player, moves, depth, alpha, beta, time_left, root_player):
+        """
+        Cherche `moves` en parallèle dans la fenêtre (alpha, beta).
+        Retourne ({coup: valeur}, noeuds) ou (None, noeuds) si le temps est écoulé.
+        Après une coupure (valeur >= beta), seuls les coups terminés figurent dans le résultat.
+        """
+        self._ensure_pool()
+        self.stop_event.clear()
+        with self.shared_alpha.get_lock():
+            self.shared_alpha.value = alpha
+
+        deadline = time.time() + time_left if time_left is not None else None
+        futures = [self.pool.submit(_search_root_move, state, player, mv, depth, deadline, root_player, beta)
+                   for mv in moves]
+
+        not_done = set(futures)
+        cutoff = False
+        while not_done and not cutoff:
+            timeout = max(deadline - time.time(), 0) if deadline is not None else None
+            done, not_done = wait(not_done, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            cutoff = any(f.result()[1] is not None and f.result()[1] >= beta for f in done)
+
+        if not_done:
+            # Délai dépassé ou coupure beta : on arrête les workers.
+            # Les coups pas encore partis sont annulés, les autres attendus au plus STOP_GRACE.
+            self.stop_event.set()
+            for future in not_done:
+                future.cancel()
+            wait(not_done, timeout=STOP_GRACE)
+
+        results = {}
+        nodes = 0
+        timed_out = bool(not_done) and not cutoff
+        for future in futures:
+            if future.cancelled() or not future.done():
+                continue
+            mv, val, count = future.result()
+            nodes += count
+            if val is None:
+                # coup interrompu : temps écoulé, ou arrêt après la coupure
+                timed_out = timed_out or not cutoff
+                continue
+            results[mv] = val
+
+        return (None if timed_out else results), nodes
+
+    def cancel(self):
+        self.stop_event.set()
+
+    # wait=True : attend la sortie des workers (obligatoire avant la fin d'un processus,
+    # sinon la sortie de l'interpréteur peut rester bloquée sur les workers du pool)
+    def shutdown(self, wait=False):
+        self.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(wait=wait, cancel_futures=True)
+            self.pool = None
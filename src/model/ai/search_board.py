@@ -0,0 +1,99 @@
+"""
+Plateau de recherche modifié sur place.
+
+L'alpha-beta ne recopie plus d'état à chaque fils : make() joue un coup et unmake()
+l'annule en mettant à jour, sans allocation de plateau, les masques de bits des deux
+camps, la clé de Zobrist, le gagnant éventuel et l'évaluation incrémentale.
+Les coups sont générés à partir des masques (tables de bitboard_rules, identiques aux
+règles Prolog) ; avec un autre backend (PrologManager), ils sont demandés au manager
+de règles à chaque noeud, comme à la racine.
+"""
+from prologRules.bitboard_rules import (WIN_MASKS, ADJACENT_MASKS, PIECES_PER_PLAYER, mask_legal_moves, mask_winner,
+                                        state_to_masks, masks_to_state)
+from prologRules.ia_helper import switch_player
+from ai.zobrist import hash_state, update_key
+
+#combinaisons gagnantes passant par chaque case : seul le pion arrive peut creer un gain
+WINS_THROUGH = tuple(tuple(w for w in WIN_MASKS if w >> i & 1) for i in range(25))
+
+
+class SearchBoard:
+    def __init__(self, inc, rules=None):
+        # Évaluation incrémentale (IncrementalEvaluation) tenue à jour par make / unmake
+        self.inc = inc
+        # Manager générant les coups (backend Prolog), None : tables de bitboard
+        self.rules = rules
+        self.reset(['e'] * 25)
+
+    def reset(self, state, key=None):
+        b, n = state_to_masks(state)
+        self.masks = {'b': b, 'n': n}
+        self.key = key if key is not None else hash_state(state)
+        self.winner = mask_winner(b, n)
+        self.history = []
+        self.inc.reset(state)
+
+    #etat liste (hors boucle de recherche)
+    @property
+    def state(self):
+        return masks_to_state(self.masks['b'], self.masks['n'])
+
+    def pieces(self):
+        return (self.masks['b'] | self.masks['n']).bit_count()
+
+    def legal_moves(self, player):
+        if self.rules is not None:
+            return self.rules.get_legal_moves(self.state, player)
+        return mask_legal_moves(self.masks[player], self.masks[switch_player(player)])
+
+    def winning_squares(self, player, placing=None):
+        """
+        Masque des cases où `player` gagne en un coup : dernière case libre d'une
+        combinaison à 3 pions, posée (placement) ou atteinte par un pion voisin pris
+        hors de cette combinaison. `placing` : phase du joueur si elle diffère du plateau.
+        """
+        own = self.masks[player]
+        if own.bit_count() < 3:
+            return 0
+        occupied = own | self.masks[switch_player(player)]
+        if placing is None:
+            placing = occupied.bit_count() < 2 * PIECES_PER_PLAYER
+        squares = 0
+        for w in WIN_MASKS:
+            rest = w & ~own
+            # exactement une case manquante, et libre
+            if not rest or rest & (rest - 1) or rest & occupied:
+                continue
+            if placing or ADJACENT_MASKS[rest.bit_length() - 1] & own & ~w:
+                squares |= rest
+        return squares
+
+    #jouer un coup
+    def make(self, player, move):
+        self.history.append((player, move, self.key, self.winner))
+        masks = self.masks
+        to = move[-1]
+        if move[0] == "placement":
+            own = masks[player] | (1 << to)
+        else:
+            own = (masks[player] & ~(1 << move[1])) | (1 << to)
+        masks[player] = own
+        self.key = update_key(self.key, player, move)
+
+        # Partie finie : le gagnant reste acquis
+        if self.winner == 'none':
+            for w in WINS_THROUGH[to]:
+                if own & w == w:
+                    self.winner = player
+                    break
+        self.inc.push(player, move)
+
+    #annuler le dernier coup
+    def unmake(self):
+        player, move, self.key, self.winner = self.history.pop()
+        masks = self.masks
+        if move[0] == "placement":
+            masks[player] &= ~(1 << move[1])
+        else:
+            masks[player] = (masks[player] & ~(1 << move[2])) | (1 << move[1])
+        self.inc.pop()
@@ -0,0 +1,142 @@
+"""
+Processus de recherche dédié.
+
+pyswip et l'alpha-beta en Python pur gardent le GIL : un simple thread de recherche
+ralentit encore le rendu. Ici MinMaxAlphaBeta tourne dans un processus séparé qui
+charge ses propres règles une seule fois au démarrage (PrologManager, ou BitboardRules
+sans SWI-Prolog). La GUI n'envoie que l'état et le joueur par un Pipe et reçoit le
+coup et les statistiques de recherche.
+Un plantage de SWI-Prolog dans le worker ne fait pas tomber l'interface.
+"""
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future
+
+# Attente maximale de la sortie propre du worker (arrêt de son pool / de ses helpers)
+SHUTDOWN_TIMEOUT = 5.0
+
+
+def _worker_main(conn, stop_event, engine_kwargs):
+    # Import local : le module est aussi importé par ai_engine
+    from ai.ai_engine import AIEngine
+
+    engine = AIEngine(**engine_kwargs)
+    engine.minmax.stop_event = stop_event
+
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, KeyboardInterrupt):
+                break
+
+            if message[0] == "stop":
+                break
+
+            if message[0] == "search":
+                _, state, player = message
+                t0 = time.perf_counter()
+                try:
+                    move = engine.get_best_move(state, player)
+                    stats = dict(engine.minmax.last_stats)
+                    stats["elapsed"] = time.perf_counter() - t0
+                    conn.send(("result", move, stats))
+                except Exception as e:
+                    conn.send(("error", repr(e), None))
+    finally:
+        # Pool de la recherche parallèle / helpers Lazy SMP arrêtés avant de sortir :
+        # un worker tué laisserait ses propres processus orphelins, et un pool non attendu
+        # peut bloquer la sortie de l'interpréteur
+        engine.shutdown(wait=True)
+        conn.close()
+
+
+class SearchWorker:
+    """Pilote un processus de recherche ; submit() renvoie un Future comme un executor."""
+
+    def __init__(self, **engine_kwargs):
+        self.engine_kwargs = engine_kwargs
+        # spawn : on ne duplique pas un SWI-Prolog déjà chargé (fork non sûr)
+        self.ctx = multiprocessing.get_context("spawn")
+        self.stop_event = self.ctx.Event()
+        self.process = None
+        self.conn = None
+        self.listener = None
+        self.pending = None
+        self.last_stats = {}
+
+    def start(self):
+        parent_conn, child_conn = self.ctx.Pipe()
+        self.process = self.ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.stop_event, self.engine_kwargs),
+            name="teeko-search",
+            # non démon : le worker peut ouvrir son propre pool (recherche parallèle) ;
+            # il s'arrête seul quand le Pipe se ferme
+            daemon=False,
+        )
+        self.process.start()
+        child_conn.close()
+
+        self.conn = parent_conn
+        self.listener = threading.Thread(target=self._listen, name="teeko-search-listener", daemon=True)
+        self.listener.start()
+
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    #lance une recherche (l'ancienne, si elle existe, doit être terminée ou annulée)
+    def submit(self, state, player):
+        if not self.is_alive():
+            self.start()
+
+        future = Future()
+        self.pending = future
+        self.stop_event.clear()
+        self.conn.send(("search", state, player))
+        return future
+
+    #reçoit les résultats du worker et complète le Future en attente
+    def _listen(self):
+        conn = self.conn
+        while True:
+            try:
+                kind, payload, stats = conn.recv()
+            except (EOFError, OSError):
+                # Worker terminé ou planté (sauf s'il a déjà été remplacé)
+                if self.conn is not conn:
+                    return
+                future, self.pending = self.pending, None
+                if future is not None and not future.done():
+                    future.set_exception(RuntimeError("Le processus de recherche s'est arrêté"))
+                return
+
+            future, self.pending = self.pending, None
+            if future is None or future.done():
+                continue
+            if kind == "result":
+                self.last_stats = stats
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(payload))
+
+    # Interrompt la recherche en cours (le worker renvoie son meilleur coup connu)
+    def cancel(self):
+        self.stop_event.set()
+
+    def shutdown(self):
+        self.cancel()
+        if self.process is None:
+            return
+        try:
+            self.conn.send(("stop",))
+        except (OSError, ValueError):
+            pass
+        # Sortie propre attendue (le worker arrête ses propres processus), terminate en dernier recours
+        self.process.join(timeout=SHUTDOWN_TIMEOUT)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+        self.process = None
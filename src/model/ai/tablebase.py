@@ -0,0 +1,212 @@
+"""
+Table de finales du Teeko (phase de déplacement, 8 pions sur le plateau).
+
+Chaque position est vue du joueur au trait : (masque du joueur au trait, masque de
+l'adversaire). Le masque du joueur au trait est ramené à sa forme canonique par
+symétrie (1666 classes au lieu de 12650), puis le masque adverse est transformé de
+la même façon et classé parmi les C(21,4) = 5985 façons de placer 4 pions sur les
+cases libres. Un octet par position :
+    0      -> nul (ou position injouable)
+    d + 1  -> distance au mat d (en demi-coups) ; d impair = gain, d pair = perte
+
+La table est produite hors ligne par tablebase_builder.py. Le lecteur la projette en
+mémoire (mmap) : rien n'est copié, les pages sont partagées entre les processus de
+recherche, et un sondage ne fait que quelques opérations sur des entiers.
+"""
+import mmap
+import os
+import struct
+from math import comb
+
+from prologRules.bitboard_rules import BOARD_SIZE, PIECES_PER_PLAYER, state_to_masks
+from prologRules.symmetry import TRANSFORMS, canonical_mask
+
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "assets", "teeko_tablebase.bin")
+
+MAGIC = b"TEEKOTB1"
+HEADER = struct.Struct("<8sII")  # magie, nb de classes, positions par classe
+
+FREE_SQUARES = BOARD_SIZE - PIECES_PER_PLAYER
+POSITIONS_PER_CLASS = comb(FREE_SQUARES, PIECES_PER_PLAYER)
+CLASSES = 1666
+TABLE_SIZE = CLASSES * POSITIONS_PER_CLASS
+MAX_DTM = 254
+
+# Résultat vu du joueur au trait
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+BINOM = tuple(tuple(comb(n, k) for k in range(PIECES_PER_PLAYER + 1)) for n in range(BOARD_SIZE + 1))
+
+
+def free_rank(mask, occupied):
+    """Rang colex de `mask` parmi les sous-ensembles des cases hors de `occupied`."""
+    rank = 0
+    k = 1
+    while mask:
+        low = mask & -mask
+        q = low.bit_length() - 1 - (occupied & (low - 1)).bit_count()
+        rank += BINOM[q][k]
+        k += 1
+        mask ^= low
+    return rank
+
+
+# -------------------------------------------------------------
+# Indexation (tables construites une seule fois, à la première ouverture)
+# -------------------------------------------------------------
+_SPLIT = 11                      # masque compressé (21 bits) coupé en 11 + 10 bits
+_SPLIT_MASK = (1 << _SPLIT) - 1
+
+_index = None
+
+
+def build_index():
+    """
+    Renvoie (masques de 4 pions, masques canoniques triés, {masque: (classe, transformation)}).
+    """
+    global _index
+    if _index is None:
+        masks = [(1 << a) | (1 << b) | (1 << c) | (1 << d)
+                 for a in range(BOARD_SIZE) for b in range(a + 1, BOARD_SIZE)
+                 for c in range(b + 1, BOARD_SIZE) for d in range(c + 1, BOARD_SIZE)]
+        canonical = {m: canonical_mask(m) for m in masks}
+        class_masks = sorted(set(c for c, _ in canonical.values()))
+        assert len(class_masks) == CLASSES
+        number = {m: i for i, m in enumerate(class_masks)}
+        class_of = {m: (number[c], t) for m, (c, t) in canonical.items()}
+        _index = (masks, class_masks, class_of)
+    return _index
+
+
+_probe_tables = None
+
+
+def _build_probe_tables():
+    """
+    Tables du sondage rapide :
+      - par masque du joueur au trait : (base de sa classe, bit compressé de chaque case
+        après symétrie) -> le masque adverse devient un masque de 21 bits en 4 OR ;
+      - rang colex de ce masque par deux tables (11 bits bas, 10 bits hauts).
+    """
+    global _probe_tables
+    if _probe_tables is not None:
+        return _probe_tables
+
+    masks, class_masks, class_of = build_index()
+    bits = [1 << i for i in range(FREE_SQUARES)]
+
+    compress = []
+    for cm in class_masks:
+        free = [s for s in range(BOARD_SIZE) if not cm >> s & 1]
+        position = [None] * BOARD_SIZE
+        for q, s in enumerate(free):
+            position[s] = q
+        compress.append(position)
+
+    movers = {}
+    for m in masks:
+        cls, t = class_of[m]
+        position = compress[cls]
+        perm = TRANSFORMS[t]
+        movers[m] = (cls * POSITIONS_PER_CLASS,
+                     tuple(0 if m >> s & 1 else bits[position[perm[s]]] for s in range(BOARD_SIZE)))
+
+    low = tuple(free_rank(c, 0) if c.bit_count() <= PIECES_PER_PLAYER else 0 for c in range(1 << _SPLIT))
+    high = []
+    for j in range(PIECES_PER_PLAYER + 1):
+        row = []
+        for c in range(1 << (FREE_SQUARES - _SPLIT)):
+            rank, k = 0, j + 1
+            for q in range(FREE_SQUARES - _SPLIT):
+                if c >> q & 1 and k <= PIECES_PER_PLAYER:
+                    rank += BINOM[q + _SPLIT][k]
+                    k += 1
+            row.append(rank)
+        high.append(tuple(row))
+
+    _probe_tables = (movers, low, tuple(high))
+    return _probe_tables
+
+
+def position_index(mover, opponent):
+    movers, low, high = _build_probe_tables()
+    base, bits = movers[mover]
+    c = 0
+    while opponent:
+        b = opponent & -opponent
+        c |= bits[b.bit_length() - 1]
+        opponent ^= b
+    lo = c & _SPLIT_MASK
+    return base + low[lo] + high[lo.bit_count()][c >> _SPLIT]
+
+
+def decode(byte):
+    """Octet de la table -> (WIN/DRAW/LOSS, dtm)."""
+    if byte == 0:
+        return DRAW, None
+    dtm = byte - 1
+    return (WIN if dtm & 1 else LOSS), dtm
+
+
+# Résultats décodés une fois pour toutes (aucune allocation au sondage)
+DECODED = tuple(decode(b) for b in range(256))
+
+
+def write_table(path, values):
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, CLASSES, POSITIONS_PER_CLASS))
+        f.write(values)
+
+
+class Tablebase:
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            magic, classes, per_class = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or classes != CLASSES or per_class != POSITIONS_PER_CLASS:
+                raise ValueError(f"Table de finales invalide : {path}")
+            if os.fstat(f.fileno()).st_size != HEADER.size + TABLE_SIZE:
+                raise ValueError(f"Table de finales tronquée : {path}")
+            # Projection en lecture seule (le descripteur peut être fermé ensuite)
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.movers, self.low, self.high = _build_probe_tables()
+        self.path = path
+        print(f"[Tablebase] {path} ouverte ({TABLE_SIZE} positions, mmap)")
+
+    #ouvre la table si le fichier existe, sinon None (le moteur joue sans)
+    @classmethod
+    def open_default(cls, path=DEFAULT_PATH):
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            print(f"[Tablebase] Ignorée : {e}")
+            return None
+
+    def probe_masks(self, mover, opponent):
+        """(WIN/DRAW/LOSS, dtm) pour le joueur au trait ; None hors phase de déplacement."""
+        entry = self.movers.get(mover)
+        if entry is None or opponent.bit_count() != PIECES_PER_PLAYER or mover & opponent:
+            return None
+        base, bits = entry
+        c = 0
+        while opponent:
+            b = opponent & -opponent
+            c |= bits[b.bit_length() - 1]
+            opponent ^= b
+        lo = c & _SPLIT_MASK
+        return DECODED[self.mm[HEADER.size + base + self.low[lo] + self.high[lo.bit_count()][c >> _SPLIT]]]
+
+    def probe(self, state, player):
+        b, n = state_to_masks(state)
+        if player == 'b':
+            return self.probe_masks(b, n)
+        return self.probe_masks(n, b)
+
+    def close(self):
+        self.mm.close()
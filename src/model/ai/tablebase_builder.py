@@ -0,0 +1,261 @@
+"""
+Construction hors ligne de la table de finales du Teeko par analyse rétrograde.
+
+Toutes les positions de la phase de déplacement (4 pions par camp) sont résolues :
+gain / perte / nul et distance au mat. On part des positions perdues (l'adversaire
+vient d'aligner ses 4 pions) puis, passe après passe :
+    - passe impaire n : gagnée en n si un fils est perdu en n-1
+    - passe paire n   : perdue en n si tous les fils sont gagnés (au plus en n-1)
+Ce qui n'est jamais résolu est nul. Les symétries du plateau ne laissent que 1666
+classes de positions du joueur au trait (voir tablebase.py pour l'indexation).
+
+Calcul vectorisé avec numpy (requis pour cet outil uniquement, pas pour le jeu) ;
+environ 1 min 30 et 1 Go de mémoire.
+
+Usage (depuis la racine du projet) :
+    python src/model/ai/tablebase_builder.py --output assets/teeko_tablebase.bin
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from prologRules.bitboard_rules import (BOARD_SIZE, PIECES_PER_PLAYER, WIN_MASKS, ADJACENT, has_win,
+                                        mask_legal_moves)
+from prologRules.symmetry import transform_mask
+from ai.tablebase import (DEFAULT_PATH, BINOM, CLASSES, FREE_SQUARES, POSITIONS_PER_CLASS, TABLE_SIZE,
+                          MAX_DTM, Tablebase, build_index, write_table)
+
+
+# -------------------------------------------------------------
+# Outils vectorisés
+# -------------------------------------------------------------
+_POPCOUNT13 = None
+
+
+def _popcount(x):
+    return _POPCOUNT13[x & 0x1FFF] + _POPCOUNT13[x >> 13]
+
+
+def _free_rank(mask, occupied):
+    """Version vectorisée de tablebase.free_rank."""
+    binom = np.array(BINOM, dtype=np.int64)
+    rank = np.zeros(mask.shape, dtype=np.int64)
+    for k in range(1, PIECES_PER_PLAYER + 1):
+        low = mask & -mask
+        pos = np.log2(low).astype(np.int64)
+        rank += binom[pos - _popcount(occupied & (low - 1)), k]
+        mask = mask ^ low
+    return rank
+
+
+def _has_win(masks):
+    win = np.zeros(masks.shape, dtype=bool)
+    for w in WIN_MASKS:
+        win |= (masks & w) == w
+    return win
+
+
+def _combinations_by_rank():
+    """(5985, 4) : positions compressées de chaque rang colex."""
+    combos = np.zeros((POSITIONS_PER_CLASS, PIECES_PER_PLAYER), dtype=np.int64)
+    for combo in itertools.combinations(range(FREE_SQUARES), PIECES_PER_PLAYER):
+        rank = sum(BINOM[q][k + 1] for k, q in enumerate(combo))
+        combos[rank] = combo
+    return combos
+
+
+# -------------------------------------------------------------
+# Graphe des coups
+# -------------------------------------------------------------
+def build_edges():
+    """
+    Pour chaque classe : masques adverses (5985,) et matrice des fils (coups, 5985),
+    indice du fils dans la table ou TABLE_SIZE (sentinelle) si la case d'arrivée est occupée.
+    """
+    masks, class_list, classes = build_index()
+    all_masks = np.array(masks, dtype=np.int64)
+    order = np.argsort(all_masks)
+    sorted_masks = all_masks[order]
+    class_of = np.array([classes[m][0] for m in masks], dtype=np.int64)[order]
+    transform_of = np.array([classes[m][1] for m in masks], dtype=np.int64)[order]
+    class_masks = np.array(class_list, dtype=np.int64)
+    combos = _combinations_by_rank()
+
+    opponents = []
+    edges = []
+    for cls, mover in enumerate(class_list):
+        free = np.array([i for i in range(BOARD_SIZE) if not mover >> i & 1], dtype=np.int64)
+        opp = np.bitwise_or.reduce(np.left_shift(1, free[combos]), axis=1)
+        opponents.append(opp)
+
+        # Le fils a l'adversaire au trait : on canonise son masque une fois pour toute la classe
+        at = np.searchsorted(sorted_masks, opp)
+        child_class = class_of[at]
+        child_transform = transform_of[at]
+        child_base = child_class * POSITIONS_PER_CLASS
+        child_occupied = class_masks[child_class]
+
+        rows = []
+        for frm in range(BOARD_SIZE):
+            if not mover >> frm & 1:
+                continue
+            for to in ADJACENT[frm]:
+                if mover >> to & 1:
+                    continue
+                moved = mover ^ (1 << frm) ^ (1 << to)
+                images = np.array([transform_mask(moved, t) for t in range(8)], dtype=np.int64)
+                child = child_base + _free_rank(images[child_transform], child_occupied)
+                child[(opp >> to) & 1 == 1] = TABLE_SIZE
+                rows.append(child.astype(np.int32))
+        edges.append(np.vstack(rows))
+
+    return opponents, edges
+
+
+# -------------------------------------------------------------
+# Analyse rétrograde
+# -------------------------------------------------------------
+def solve(opponents, edges):
+    # Octet par position (+ sentinelle "gagné en 1" pour les coups impossibles)
+    values = np.zeros(TABLE_SIZE + 1, dtype=np.uint8)
+    values[TABLE_SIZE] = 2
+    resolved = np.zeros(TABLE_SIZE, dtype=bool)
+
+    for cls, mover in enumerate(build_index()[1]):
+        rows = slice(cls * POSITIONS_PER_CLASS, (cls + 1) * POSITIONS_PER_CLASS)
+        lost = _has_win(opponents[cls])
+        values[rows][lost] = 1
+        resolved[rows] = lost
+        # Le joueur au trait a déjà aligné ses pions : position injouable, laissée à 0
+        if has_win(mover):
+            resolved[rows] = True
+
+    print(f"[TB] Passe 0 : {int(resolved.sum())} positions terminales")
+
+    n = 1
+    while True:
+        t0 = time.perf_counter()
+        found = 0
+        for cls in range(CLASSES):
+            rows = slice(cls * POSITIONS_PER_CLASS, (cls + 1) * POSITIONS_PER_CLASS)
+            todo = ~resolved[rows]
+            if not todo.any():
+                continue
+
+            children = values[edges[cls]]
+            if n & 1:
+                hit = (children == n).any(axis=0)
+            else:
+                hit = ((children & 1) == 0).all(axis=0) & (children != 0).all(axis=0)
+            hit &= todo
+
+            count = int(hit.sum())
+            if count:
+                values[rows][hit] = n + 1
+                resolved[rows] |= hit
+                found += count
+
+        kind = "gains" if n & 1 else "pertes"
+        print(f"[TB] Passe {n} : {found} {kind} ({time.perf_counter() - t0:.1f}s)")
+        if not found:
+            break
+        if n >= MAX_DTM:
+            raise RuntimeError("Distance au mat trop grande pour un octet")
+        n += 1
+
+    return values[:TABLE_SIZE]
+
+
+# -------------------------------------------------------------
+# Vérification par sondage (indexation Python vs numpy, cohérence minimax)
+# -------------------------------------------------------------
+def verify(table, samples, seed):
+    rng = random.Random(seed)
+    errors = 0
+    for _ in range(samples):
+        squares = rng.sample(range(BOARD_SIZE), 2 * PIECES_PER_PLAYER)
+        mover = sum(1 << i for i in squares[:PIECES_PER_PLAYER])
+        opponent = sum(1 << i for i in squares[PIECES_PER_PLAYER:])
+        if has_win(mover) or has_win(opponent):
+            continue
+
+        result, dtm = table.probe_masks(mover, opponent)
+        best = None
+        for mv in mask_legal_moves(mover, opponent):
+            moved = mover ^ (1 << mv[1]) ^ (1 << mv[2])
+            if has_win(moved):
+                child = (1, 1)
+            else:
+                r, d = table.probe_masks(opponent, moved)
+                child = (-r, None if d is None else d + 1)
+            if best is None or _better(child, best):
+                best = child
+        if best is None:
+            continue
+        if best[0] != result or (result != 0 and best[1] != dtm):
+            errors += 1
+            print(f"[TB] Incohérence : mover={mover:#x} opp={opponent:#x} table={(result, dtm)} fils={best}")
+    return errors
+
+
+def _better(a, b):
+    """a meilleur que b pour le joueur au trait (gain court > nul > perte longue)."""
+    if a[0] != b[0]:
+        return a[0] > b[0]
+    if a[0] > 0:
+        return a[1] < b[1]
+    if a[0] < 0:
+        return a[1] > b[1]
+    return False
+
+
+def main(argv=None):
+    global _POPCOUNT13
+    parser = argparse.ArgumentParser(description="Table de finales du Teeko (analyse rétrograde)")
+    parser.add_argument("--output", default=DEFAULT_PATH)
+    parser.add_argument("--verify", type=int, default=5000,
+                        help="nombre de positions tirées au hasard pour la vérification")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("[TB] numpy est requis pour construire la table (pip install numpy)")
+        return 1
+    _POPCOUNT13 = np.array([bin(i).count("1") for i in range(1 << 13)], dtype=np.int64)
+
+    t0 = time.perf_counter()
+    print(f"[TB] {CLASSES} classes x {POSITIONS_PER_CLASS} positions = {TABLE_SIZE}")
+    opponents, edges = build_edges()
+    print(f"[TB] Graphe des coups : {sum(e.size for e in edges)} arcs ({time.perf_counter() - t0:.1f}s)")
+
+    values = solve(opponents, edges)
+    del edges
+
+    wins = int(((values != 0) & (values % 2 == 0)).sum())
+    losses = int((values % 2 == 1).sum())
+    print(f"[TB] Gains={wins} | Pertes={losses} | Nuls={TABLE_SIZE - wins - losses}"
+          f" | DTM max={int(values.max()) - 1}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    write_table(args.output, values.tobytes())
+    print(f"[TB] Écrit : {args.output} ({time.perf_counter() - t0:.1f}s)")
+
+    errors = verify(Tablebase(args.output), args.verify, args.seed)
+    print(f"[TB] Vérification : {errors} incohérence(s) sur {args.verify} positions")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
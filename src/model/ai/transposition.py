@@ -0,0 +1,246 @@
+"""
+Table de transposition de l'alpha-beta.
+
+Chaque entree garde la valeur, la profondeur de recherche, la nature de la borne
+(EXACT / LOWER / UPPER) et le meilleur coup trouve. La table a une capacite fixe
+(tableau de slots indexe par la cle de Zobrist) et survit d'un coup a l'autre :
+une entree est remplacee si elle provient d'une recherche plus ancienne ou si la
+nouvelle a ete calculee au moins aussi profondement.
+"""
+
+# Nature de la valeur stockee
+EXACT = 0   # valeur exacte
+LOWER = 1   # fail-high : la vraie valeur est >= value
+UPPER = 2   # fail-low  : la vraie valeur est <= value
+
+
+class TranspositionTable:
+    def __init__(self, capacity=1 << 18):
+        self.capacity = capacity
+        # slot : (cle, valeur, profondeur, flag, coup, generation)
+        self.slots = [None] * capacity
+        self.generation = 0
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.used = 0
+
+    #nouvelle recherche (un coup joue) : les anciennes entrees deviennent remplacables
+    def new_search(self):
+        self.generation += 1
+
+    def probe(self, key):
+        """Renvoie (valeur, profondeur, flag, coup) ou None."""
+        self.probes += 1
+        entry = self.slots[key % self.capacity]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1], entry[2], entry[3], entry[4]
+        return None
+
+    def store(self, key, value, depth, flag, move):
+        index = key % self.capacity
+        entry = self.slots[index]
+
+        if entry is None:
+            self.used += 1
+        elif entry[0] == key:
+            # Meme position : on garde le coup connu si on n'en a pas de nouveau
+            if move is None:
+                move = entry[4]
+        elif entry[5] == self.generation and entry[2] > depth:
+            # Entree recente et plus profonde : on la garde
+            return
+
+        self.slots[index] = (key, value, depth, flag, move, self.generation)
+        self.stores += 1
+
+    def clear(self):
+        self.slots = [None] * self.capacity
+        self.used = 0
+
+    def stats(self):
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "stores": self.stores,
+            "fill": self.used / self.capacity,
+        }
+
+
+# -------------------------------------------------------------
+# Version compacte : tampons préalloués de mots de 64 bits
+# -------------------------------------------------------------
+# Codage d'un coup sur 10 bits : 0 = aucun, 1..25 = placement, 26.. = shift(from, to)
+_PLACEMENT_BASE = 1
+_SHIFT_BASE = 26
+
+MOVES_BY_CODE = [None] * (_SHIFT_BASE + 25 * 25)
+for _i in range(25):
+    MOVES_BY_CODE[_PLACEMENT_BASE + _i] = ("placement", _i)
+    for _j in range(25):
+        MOVES_BY_CODE[_SHIFT_BASE + _i * 25 + _j] = ("shift", _i, _j)
+
+
+def encode_move(move):
+    if move is None:
+        return 0
+    if move[0] == "placement":
+        return _PLACEMENT_BASE + move[1]
+    return _SHIFT_BASE + move[1] * 25 + move[2]
+
+
+# Disposition d'un mot de données :
+#   bits  0-31 valeur (+ 2^31)   bits 32-39 profondeur   bits 40-41 flag
+#   bits 42-51 coup              bits 52-59 génération
+_VALUE_OFFSET = 1 << 31
+_MASK8 = 0xFF
+_MASK10 = 0x3FF
+_MASK32 = 0xFFFFFFFF
+
+ENTRY_BYTES = 16  # mot de contrôle + mot de données
+FILL_SAMPLES = 4096  # slots lus par stats() pour estimer le remplissage
+
+
+class CompactTranspositionTable:
+    """
+    Table de transposition sur deux tableaux de mots de 64 bits (contrôle, données).
+
+    Le mot de contrôle vaut cle XOR données : une entrée n'est valide que si ce XOR
+    redonne la clé, ce qui détecte aussi une écriture concurrente incomplète.
+    Les slots vont par paires (buckets) : le premier garde l'entrée la plus profonde,
+    le second reçoit toujours la plus récente.
+    Les compteurs de stats() sont ceux du processus courant ; le remplissage est
+    estimé en lisant le tampon, il compte donc aussi les écritures des autres
+    processus (table partagée).
+    """
+
+    def __init__(self, size_mb=16, buffer=None):
+        if buffer is None:
+            buffer = bytearray(int(size_mb * (1 << 20)))
+        slots = (len(buffer) // ENTRY_BYTES) & ~1
+
+        self.buffer = buffer
+        self.raw = memoryview(buffer).cast('B')[:slots * ENTRY_BYTES]
+        words = self.raw.cast('Q')
+        self.check = words[:slots]
+        self.data = words[slots:]
+        self.slots = slots
+        self.buckets = slots // 2
+        self.generation = 0
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        # Entrées valides écrasées par une autre position (pas des collisions de clé)
+        self.replacements = 0
+
+    def new_search(self):
+        self.generation = (self.generation + 1) & _MASK8
+
+    def probe(self, key):
+        """Renvoie (valeur, profondeur, flag, coup) ou None."""
+        self.probes += 1
+        i = (key % self.buckets) * 2
+        for slot in (i, i + 1):
+            d = self.data[slot]
+            if d and self.check[slot] ^ d == key:
+                self.hits += 1
+                return ((d & _MASK32) - _VALUE_OFFSET,
+                        (d >> 32) & _MASK8,
+                        (d >> 40) & 3,
+                        MOVES_BY_CODE[(d >> 42) & _MASK10])
+        return None
+
+    def store(self, key, value, depth, flag, move):
+        check, data = self.check, self.data
+        i0 = (key % self.buckets) * 2
+        i1 = i0 + 1
+        code = encode_move(move)
+
+        d0 = data[i0]
+        d1 = data[i1]
+        if d0 and check[i0] ^ d0 == key:
+            slot, old = i0, d0
+        elif d1 and check[i1] ^ d1 == key:
+            slot, old = i1, d1
+        else:
+            old = 0
+            if not d0 or depth >= (d0 >> 32) & _MASK8 or (d0 >> 52) & _MASK8 != self.generation:
+                # Slot profondeur : l'ancienne entrée descend dans le slot "toujours"
+                if d0:
+                    if d1:
+                        self.replacements += 1
+                    check[i1] = check[i0]
+                    data[i1] = d0
+                slot = i0
+            else:
+                if d1:
+                    self.replacements += 1
+                slot = i1
+
+        # Même position sans nouveau coup : on garde le coup connu
+        if old and not code:
+            code = (old >> 42) & _MASK10
+
+        d = ((value + _VALUE_OFFSET) & _MASK32) | (min(depth, _MASK8) << 32) | (flag << 40) \
+            | (code << 42) | (self.generation << 52)
+        data[slot] = d
+        check[slot] = key ^ d
+        self.stores += 1
+
+    def clear(self):
+        self.raw[:] = bytes(len(self.raw))
+
+    #part des slots occupés, sur un échantillon régulier du tampon
+    def fill(self):
+        step = max(self.slots // FILL_SAMPLES, 1)
+        data = self.data
+        samples = range(0, self.slots, step)
+        return sum(1 for i in samples if data[i]) / len(samples)
+
+    def stats(self):
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "stores": self.stores,
+            "replacements": self.replacements,
+            "fill": self.fill(),
+        }
+
+
+class SharedTranspositionTable(CompactTranspositionTable):
+    """
+    Table compacte placée dans multiprocessing.shared_memory : plusieurs processus
+    (Lazy SMP) lisent et écrivent la même table sans verrou. Le mot de contrôle
+    (clé XOR données) élimine les entrées écrites à moitié par un autre processus.
+    """
+
+    def __init__(self, size_mb=16, name=None):
+        from multiprocessing import shared_memory
+
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=int(size_mb * (1 << 20)))
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+
+        super().__init__(buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        if self.shm is None:
+            return
+        # Les vues doivent être libérées avant de fermer le segment
+        for view in (self.check, self.data, self.raw):
+            view.release()
+        self.buffer = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
@@ -0,0 +1,100 @@
+"""
+Hachage de Zobrist pour le Teeko.
+
+Chaque (joueur, case) recoit un entier aleatoire de 64 bits ; la cle d'un plateau est le
+XOR des cles de ses pions. Un coup ne modifie qu'une ou deux cases, donc la cle du fils
+s'obtient en O(1) par XOR a partir de celle du pere, sans reconstruire tuple(state).
+
+La cle d'une position est en fait un 8-uplet : la cle du plateau vu a travers chacune
+des 8 symetries, tenues a jour ensemble. La table de transposition utilise la plus
+petite (canonical_key) : les positions symetriques partagent la meme entree.
+Les cles des pions 'n' sont celles des pions 'b' tournees de 32 bits : echanger les
+couleurs revient a tourner la cle, ce qui fusionne aussi les positions aux couleurs
+echangees.
+"""
+import random
+
+from prologRules.bitboard_rules import PLACEMENT_MOVES, SHIFT_MOVES, TeekoState
+from prologRules.symmetry import TRANSFORMS
+
+BOARD_SIZE = 25
+SYMMETRIES = 8
+MASK64 = (1 << 64) - 1
+
+
+def rotl32(key):
+    return ((key << 32) | (key >> 32)) & MASK64
+
+
+# Graine fixe : les cles sont identiques d'une execution (ou d'un processus) a l'autre
+_rng = random.Random(0x7EE40)
+
+_b_keys = tuple(_rng.getrandbits(64) for _ in range(BOARD_SIZE))
+PIECE_KEYS = {
+    'b': _b_keys,
+    'n': tuple(rotl32(k) for k in _b_keys),
+}
+
+# Joueur au trait == joueur racine (les valeurs de l'alpha-beta sont relatives a lui)
+MOVER_IS_ROOT_KEY = _rng.getrandbits(64)
+
+#SQUARE_KEYS[joueur][i] : cles de la case i dans chacune des 8 images du plateau
+SQUARE_KEYS = {
+    p: tuple(tuple(PIECE_KEYS[p][TRANSFORMS[t][i]] for t in range(SYMMETRIES)) for i in range(BOARD_SIZE))
+    for p in ('b', 'n')
+}
+
+
+def _xor8(a, b):
+    return tuple(x ^ y for x, y in zip(a, b))
+
+
+#MOVE_KEYS[joueur][coup] : 8-uplet a XORer pour jouer (ou dejouer) le coup
+MOVE_KEYS = {}
+for _p in ('b', 'n'):
+    _keys = {}
+    for _mv in PLACEMENT_MOVES:
+        _keys[_mv] = SQUARE_KEYS[_p][_mv[1]]
+    for _moves in SHIFT_MOVES:
+        for _, _mv in _moves:
+            _keys[_mv] = _xor8(SQUARE_KEYS[_p][_mv[1]], SQUARE_KEYS[_p][_mv[2]])
+    MOVE_KEYS[_p] = _keys
+
+
+#cle complete d'un plateau (calculee une seule fois, a la racine)
+def hash_state(state):
+    keys = (0,) * SYMMETRIES
+    if isinstance(state, TeekoState):
+        for p, mask in (('b', state.b), ('n', state.n)):
+            while mask:
+                low = mask & -mask
+                keys = _xor8(keys, SQUARE_KEYS[p][low.bit_length() - 1])
+                mask ^= low
+        return keys
+    for i, v in enumerate(state):
+        if v == 'b' or v == 'n':
+            keys = _xor8(keys, SQUARE_KEYS[v][i])
+    return keys
+
+
+#cle du fils apres un placement ou un deplacement de `player`
+def update_key(keys, player, move):
+    d = MOVE_KEYS[player][move]
+    return (keys[0] ^ d[0], keys[1] ^ d[1], keys[2] ^ d[2], keys[3] ^ d[3],
+            keys[4] ^ d[4], keys[5] ^ d[5], keys[6] ^ d[6], keys[7] ^ d[7])
+
+
+def canonical_key(keys, player, root_player):
+    """
+    Cle de transposition commune a toutes les positions equivalentes (symetries,
+    echange des couleurs) et transformation vers la forme canonique, pour y ramener
+    les coups stockes.
+    """
+    # Plateau vu du joueur au trait : 'n' au trait -> couleurs echangees
+    if player == 'n':
+        keys = tuple(map(rotl32, keys))
+    key = min(keys)
+    t = keys.index(key)
+    if player == root_player:
+        key ^= MOVER_IS_ROOT_KEY
+    return key, t
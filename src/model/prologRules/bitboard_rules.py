@@ -0,0 +1,327 @@
+#Regles du Teeko en Python pur sur des bitboards (meme interface que PrologManager)
+#Chaque camp est un entier de 25 bits : le bit i vaut 1 si la case i est occupee par ce joueur.
+#Les tables (combinaisons gagnantes, adjacences, listes de coups) sont precalculees une seule
+#fois a partir de teeko_rules.pl, ce qui evite tout aller-retour Prolog pendant la recherche.
+BOARD_SIZE = 25
+FULL_MASK = (1 << BOARD_SIZE) - 1
+PIECES_PER_PLAYER = 4
+
+#combinaisons gagnantes (copie de winning_positions/1 dans teeko_rules.pl)
+WINNING_POSITIONS = [
+    # Horizontales
+    [0, 1, 2, 3], [1, 2, 3, 4],
+    [5, 6, 7, 8], [6, 7, 8, 9],
+    [10, 11, 12, 13], [11, 12, 13, 14],
+    [15, 16, 17, 18], [16, 17, 18, 19],
+    [20, 21, 22, 23], [21, 22, 23, 24],
+
+    # Verticales
+    [0, 5, 10, 15], [5, 10, 15, 20],
+    [1, 6, 11, 16], [6, 11, 16, 21],
+    [2, 7, 12, 17], [7, 12, 17, 22],
+    [3, 8, 13, 18], [8, 13, 18, 23],
+    [4, 9, 14, 19], [9, 14, 19, 24],
+
+    # Diagonales
+    [0, 6, 12, 18], [6, 12, 18, 24], [1, 7, 13, 19], [5, 11, 17, 23],
+    [4, 8, 12, 16], [8, 12, 16, 20], [3, 7, 11, 15], [9, 13, 17, 21],
+
+    # Carrés 2x2
+    [0, 1, 5, 6], [1, 2, 6, 7], [2, 3, 7, 8], [3, 4, 8, 9],
+    [5, 6, 10, 11], [6, 7, 11, 12], [7, 8, 12, 13], [8, 9, 13, 14],
+    [10, 11, 15, 16], [11, 12, 16, 17], [12, 13, 17, 18], [13, 14, 18, 19],
+    [15, 16, 20, 21], [16, 17, 21, 22], [17, 18, 22, 23], [18, 19, 23, 24],
+]
+
+
+def _mask_of(indices):
+    mask = 0
+    for i in indices:
+        mask |= 1 << i
+    return mask
+
+
+#adjacent(I1,I2) : meme definition que dans teeko_rules.pl (8 voisins)
+def _adjacent_squares(i):
+    x1, y1 = i % 5, i // 5
+    result = []
+    for j in range(BOARD_SIZE):
+        x2, y2 = j % 5, j // 5
+        dx, dy = abs(x1 - x2), abs(y1 - y2)
+        if dx <= 1 and dy <= 1 and (dx + dy) > 0:
+            result.append(j)
+    return tuple(result)
+
+
+WIN_MASKS = tuple(_mask_of(p) for p in WINNING_POSITIONS)
+
+#voisins de chaque case (ordre croissant, comme findall/nth0 en Prolog)
+ADJACENT = tuple(_adjacent_squares(i) for i in range(BOARD_SIZE))
+ADJACENT_MASKS = tuple(_mask_of(a) for a in ADJACENT)
+
+#coups precalcules (memes tuples que move_to_python)
+PLACEMENT_MOVES = tuple(("placement", i) for i in range(BOARD_SIZE))
+SHIFT_MOVES = tuple(tuple((j, ("shift", i, j)) for j in ADJACENT[i]) for i in range(BOARD_SIZE))
+
+
+# -------------------------------------------------------------
+# Fonctions sur les masques
+# -------------------------------------------------------------
+def state_to_masks(state):
+    """Convertit un etat ['e','b','n',...] (ou un TeekoState) en (masque_b, masque_n)."""
+    if isinstance(state, TeekoState):
+        return state.b, state.n
+    b = n = 0
+    for i, v in enumerate(state):
+        if v == 'b':
+            b |= 1 << i
+        elif v == 'n':
+            n |= 1 << i
+    return b, n
+
+
+def masks_to_state(b, n):
+    """Convertit (masque_b, masque_n) en etat liste."""
+    state = ['e'] * BOARD_SIZE
+    for i in range(BOARD_SIZE):
+        bit = 1 << i
+        if b & bit:
+            state[i] = 'b'
+        elif n & bit:
+            state[i] = 'n'
+    return state
+
+
+def has_win(mask):
+    for w in WIN_MASKS:
+        if mask & w == w:
+            return True
+    return False
+
+
+#meme ordre que game_over/2 : b est teste avant n
+def mask_winner(b, n):
+    if has_win(b):
+        return 'b'
+    if has_win(n):
+        return 'n'
+    return 'none'
+
+
+def mask_legal_moves(own, opp):
+    """Coups legaux du joueur possedant `own`, dans l'ordre de legal_moves/3."""
+    occupied = own | opp
+    if occupied.bit_count() < 2 * PIECES_PER_PLAYER:
+        return [PLACEMENT_MOVES[i] for i in range(BOARD_SIZE) if not occupied >> i & 1]
+
+    moves = []
+    for i in range(BOARD_SIZE):
+        if own >> i & 1:
+            for j, mv in SHIFT_MOVES[i]:
+                if not occupied >> j & 1:
+                    moves.append(mv)
+    return moves
+
+
+# -------------------------------------------------------------
+# Etat compact
+# -------------------------------------------------------------
+class TeekoState:
+    """
+    Etat de jeu compact : masques de 25 bits des deux camps, joueur au trait et nombre
+    de pions. Hachable et traite comme immuable (play() renvoie un nouvel etat).
+    Il se lit aussi comme la liste ['e','b','n',...] (state[i], iteration, count) :
+    la forme liste n'est reconstruite qu'aux frontieres (interface, requetes Prolog).
+    """
+    __slots__ = ("b", "n", "player", "pieces")
+
+    def __init__(self, b=0, n=0, player='n'):
+        self.b = b
+        self.n = n
+        self.player = player
+        self.pieces = (b | n).bit_count()
+
+    @classmethod
+    def from_list(cls, state, player='n'):
+        b, n = state_to_masks(state)
+        return cls(b, n, player)
+
+    def to_list(self):
+        return masks_to_state(self.b, self.n)
+
+    #(masque du joueur, masque de l'adversaire), joueur au trait par defaut
+    def masks(self, player=None):
+        if (player or self.player) == 'b':
+            return self.b, self.n
+        return self.n, self.b
+
+    #index des pions du joueur (sans requete player_positions)
+    def positions(self, player):
+        mask = self.b if player == 'b' else self.n
+        return [i for i in range(BOARD_SIZE) if mask >> i & 1]
+
+    def phase(self):
+        return "placement" if self.pieces < 2 * PIECES_PER_PLAYER else "deplacement"
+
+    def winner(self):
+        return mask_winner(self.b, self.n)
+
+    def legal_moves(self):
+        return mask_legal_moves(*self.masks())
+
+    #etat apres un coup du joueur au trait (coup suppose legal)
+    def play(self, move):
+        own, opp = self.masks()
+        if move[0] == "placement":
+            own |= 1 << move[1]
+        else:
+            own = (own & ~(1 << move[1])) | (1 << move[2])
+        if self.player == 'b':
+            return TeekoState(own, opp, 'n')
+        return TeekoState(opp, own, 'b')
+
+    #lecture comme une liste d'etat
+    def __len__(self):
+        return BOARD_SIZE
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.to_list()[i]
+        if i < 0:
+            i += BOARD_SIZE
+        if not 0 <= i < BOARD_SIZE:
+            raise IndexError(i)
+        if self.b >> i & 1:
+            return 'b'
+        if self.n >> i & 1:
+            return 'n'
+        return 'e'
+
+    def __iter__(self):
+        return iter(masks_to_state(self.b, self.n))
+
+    def count(self, value):
+        if value == 'b':
+            return self.b.bit_count()
+        if value == 'n':
+            return self.n.bit_count()
+        if value == 'e':
+            return BOARD_SIZE - self.pieces
+        return 0
+
+    def __eq__(self, other):
+        if not isinstance(other, TeekoState):
+            return NotImplemented
+        return self.b == other.b and self.n == other.n and self.player == other.player
+
+    def __hash__(self):
+        return (self.n << BOARD_SIZE | self.b) << 1 | (self.player == 'b')
+
+    def __repr__(self):
+        return f"TeekoState({''.join(self)!r}, {self.player!r})"
+
+
+class BitboardRules:
+    """Backend de regles sans Prolog, interchangeable avec PrologManager."""
+
+    #tables precalculees a l'import du module : rien a charger ici
+    def __init__(self, verbose=False):
+        if verbose:
+            print("[BitboardRules] Tables precalculees OK")
+
+    #phase de jeu (placement ou deplacement)
+    def get_phase(self, state):
+        b, n = state_to_masks(state)
+        if (b | n).bit_count() < 2 * PIECES_PER_PLAYER:
+            return "placement"
+        return "deplacement"
+
+    #coups valides
+    def get_legal_moves(self, state, player):
+        b, n = state_to_masks(state)
+        if player == 'b':
+            return mask_legal_moves(b, n)
+        return mask_legal_moves(n, b)
+
+    #appliquer un coup (None si apply_move/4 echouerait)
+    def apply_move(self, state, player, move):
+        if move[0] == "placement":
+            index = move[1]
+            if not 0 <= index < BOARD_SIZE or state[index] != 'e':
+                return None
+            new_state = list(state)
+            new_state[index] = player
+            return new_state
+
+        frm, to = move[1], move[2]
+        if not (0 <= frm < BOARD_SIZE and 0 <= to < BOARD_SIZE):
+            return None
+        new_state = list(state)
+        new_state[frm] = 'e'
+        new_state[to] = player
+        return new_state
+
+    #expansion d'un noeud : liste de (coup, nouvel etat, gagnant), comme expand/3
+    def expand(self, state, player):
+        b, n = state_to_masks(state)
+        own, opp = (b, n) if player == 'b' else (n, b)
+
+        children = []
+        for mv in mask_legal_moves(own, opp):
+            if mv[0] == "placement":
+                new_own = own | (1 << mv[1])
+            else:
+                new_own = (own & ~(1 << mv[1])) | (1 << mv[2])
+            child_b, child_n = (new_own, opp) if player == 'b' else (opp, new_own)
+            children.append((mv, masks_to_state(child_b, child_n), mask_winner(child_b, child_n)))
+        return children
+
+    #verifier fin de partie
+    def is_terminal(self, state):
+        b, n = state_to_masks(state)
+        return has_win(b) or has_win(n)
+
+    #renvoie gagnant (b ou n ou none)
+    def winner(self, state):
+        b, n = state_to_masks(state)
+        return mask_winner(b, n)
+
+    #nb pions du joueur
+    def count_pieces(self, state, player):
+        return sum(1 for v in state if v == player)
+
+    #index des pions
+    def get_index(self, x, y):
+        if 0 <= x < 5 and 0 <= y < 5:
+            return y * 5 + x
+        return None
+
+    #empty positions(indices)
+    def get_empty_positions(self, state):
+        return [i for i, v in enumerate(state) if v == 'e']
+
+    #postions du joueur(indices)
+    def get_player_positions(self, state, player):
+        if isinstance(state, TeekoState):
+            return state.positions(player)
+        return [i for i, v in enumerate(state) if v == player]
+
+    #winning positions
+    def get_winning_positions(self):
+        return [list(p) for p in WINNING_POSITIONS]
+
+    # Valider un move Python
+    def validate_move(self, state, player, move):
+        b, n = state_to_masks(state)
+        occupied = b | n
+        placement = occupied.bit_count() < 2 * PIECES_PER_PLAYER
+
+        if move[0] == "placement":
+            index = move[1]
+            return placement and 0 <= index < BOARD_SIZE and state[index] == 'e'
+        elif move[0] == "shift":
+            frm, to = move[1], move[2]
+            if placement or not (0 <= frm < BOARD_SIZE and 0 <= to < BOARD_SIZE):
+                return False
+            return state[frm] == player and state[to] == 'e' and to in ADJACENT[frm]
+        return False
@@ -0,0 +1,119 @@
+#Cache memoisant devant PrologManager (ou tout backend de regles de meme interface)
+#Les requetes en lecture seule sont indexees par la forme canonique du plateau (la plus
+#petite de ses 8 images symetriques) et gardees dans un LRU borne : une position et ses
+#symetriques partagent la meme entree. Les resultats sont stockes dans le repere canonique
+#et ramenes dans le repere de l'appelant. Les autres appels sont transmis tels quels.
+import os
+import sys
+from collections import OrderedDict
+from operator import itemgetter
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from prologRules.prolog_manager import PrologManager
+from prologRules.symmetry import INVERSE, TRANSFORMS, canonical_state, transform_move, transform_state
+
+
+class CachedPrologManager:
+    def __init__(self, manager=None, max_entries=200000, prolog_file="teeko_rules.pl"):
+        # Manager sous-jacent (PrologManager par defaut)
+        self.manager = manager if manager is not None else PrologManager(prolog_file)
+
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    #recherche dans le LRU, calcule et insere en cas d'absence
+    def _cached(self, key, compute):
+        cache = self.cache
+        if key in cache:
+            cache.move_to_end(key)
+            self.hits += 1
+            return cache[key]
+
+        self.misses += 1
+        value = compute()
+        cache[key] = value
+        if len(cache) > self.max_entries:
+            cache.popitem(last=False)
+        return value
+
+    # -------------------------------------------------------------
+    # Requetes en lecture seule (memoisees)
+    # -------------------------------------------------------------
+    # Invariants par symetrie : seule la cle change
+    def get_phase(self, state):
+        key, _ = canonical_state(state)
+        return self._cached(("phase", key),
+                            lambda: self.manager.get_phase(state))
+
+    def winner(self, state):
+        key, _ = canonical_state(state)
+        return self._cached(("winner", key),
+                            lambda: self.manager.winner(state))
+
+    def is_terminal(self, state):
+        key, _ = canonical_state(state)
+        return self._cached(("is_terminal", key),
+                            lambda: self.manager.is_terminal(state))
+
+    def count_pieces(self, state, player):
+        key, _ = canonical_state(state)
+        return self._cached(("count_pieces", key, player),
+                            lambda: self.manager.count_pieces(state, player))
+
+    # Coups, etats et cases : stockes dans le repere canonique, renvoyes dans l'ordre du manager
+    def get_legal_moves(self, state, player):
+        key, t = canonical_state(state)
+        moves = self._cached(("legal_moves", key, player),
+                             lambda: tuple(transform_move(mv, t)
+                                           for mv in self.manager.get_legal_moves(state, player)))
+        back = INVERSE[t]
+        return sorted(transform_move(mv, back) for mv in moves)
+
+    def expand(self, state, player):
+        key, t = canonical_state(state)
+        children = self._cached(("expand", key, player),
+                                lambda: tuple((transform_move(mv, t), tuple(transform_state(child, t)), winner)
+                                              for mv, child, winner in self.manager.expand(state, player)))
+        back = INVERSE[t]
+        return sorted(((transform_move(mv, back), transform_state(child, back), winner)
+                       for mv, child, winner in children), key=itemgetter(0))
+
+    def get_player_positions(self, state, player):
+        key, t = canonical_state(state)
+        positions = self._cached(("player_positions", key, player),
+                                 lambda: tuple(TRANSFORMS[t][i]
+                                               for i in self.manager.get_player_positions(state, player)))
+        back = TRANSFORMS[INVERSE[t]]
+        return sorted(back[i] for i in positions)
+
+    def get_empty_positions(self, state):
+        key, t = canonical_state(state)
+        positions = self._cached(("empty_positions", key),
+                                 lambda: tuple(TRANSFORMS[t][i] for i in self.manager.get_empty_positions(state)))
+        back = TRANSFORMS[INVERSE[t]]
+        return sorted(back[i] for i in positions)
+
+    # -------------------------------------------------------------
+    # Autres appels : transmis au manager
+    # -------------------------------------------------------------
+    def __getattr__(self, name):
+        return getattr(self.manager, name)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.cache),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,240 @@
+"""
+Harnais de conformite differentielle entre les regles Prolog (teeko_rules.pl) et un
+backend de regles rapide (BitboardRules, ...).
+
+On parcourt un grand nombre de positions atteignables (enumeration exhaustive des
+debuts de placement + parties aleatoires + positions de deplacement tirees au hasard),
+on pose les memes questions aux deux backends et on signale toute divergence.
+Chaque appel est chronometre pour suivre le gain de vitesse.
+
+Usage (depuis la racine du projet, SWI-Prolog installe) :
+    python src/model/prologRules/conformance.py --samples 2000 --backend bitboard
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from prologRules.prolog_manager import PrologManager
+from prologRules.bitboard_rules import BitboardRules, BOARD_SIZE
+from prologRules.ia_helper import switch_player
+
+# Backends candidats disponibles
+BACKENDS = {
+    "bitboard": BitboardRules,
+}
+
+# Appels compares (nom affiche -> methode du manager)
+CHECKED_CALLS = {
+    "legal_moves": "get_legal_moves",
+    "expand": "expand",
+    "apply_move": "apply_move",
+    "game_over": "winner",
+    "is_terminal": "is_terminal",
+    "phase": "get_phase",
+    "valid_shift": "validate_move",
+}
+
+
+class TimedBackend:
+    """Enveloppe un manager et mesure la latence de chaque appel."""
+
+    def __init__(self, name, manager):
+        self.name = name
+        self.manager = manager
+        self.stats = {}  # appel -> [nb appels, temps total (s)]
+
+    def call(self, label, *args):
+        method = getattr(self.manager, CHECKED_CALLS[label])
+        t0 = time.perf_counter()
+        result = method(*args)
+        dt = time.perf_counter() - t0
+
+        entry = self.stats.setdefault(label, [0, 0.0])
+        entry[0] += 1
+        entry[1] += dt
+        return result
+
+    def mean_us(self, label):
+        count, total = self.stats.get(label, (0, 0.0))
+        return (total / count) * 1e6 if count else 0.0
+
+
+class ConformanceReport:
+    def __init__(self):
+        self.positions = 0
+        self.checks = 0
+        self.mismatches = []
+
+    def record(self, label, state, args, expected, got):
+        self.checks += 1
+        if expected != got:
+            self.mismatches.append((label, list(state), args, expected, got))
+
+
+# -------------------------------------------------------------
+# Normalisation des resultats (pyswip renvoie parfois des Atom)
+# -------------------------------------------------------------
+def _norm_state(state):
+    if state is None:
+        return None
+    return [str(x) for x in state]
+
+
+def _norm_moves(moves):
+    return [tuple(m) for m in moves]
+
+
+# -------------------------------------------------------------
+# Generation des positions
+# -------------------------------------------------------------
+def enumerate_positions(max_pieces):
+    """Toutes les positions de placement avec au plus max_pieces pions ('n' commence)."""
+    for total in range(max_pieces + 1):
+        count_n = (total + 1) // 2
+        count_b = total // 2
+        for occupied in itertools.combinations(range(BOARD_SIZE), total):
+            for n_squares in itertools.combinations(occupied, count_n):
+                state = ['e'] * BOARD_SIZE
+                for i in occupied:
+                    state[i] = 'b'
+                for i in n_squares:
+                    state[i] = 'n'
+                player = 'b' if count_n > count_b else 'n'
+                yield state, player
+
+
+def sample_positions(reference, count, rng):
+    """Positions atteignables par parties aleatoires jouees avec les regles de reference."""
+    produced = 0
+    while produced < count:
+        state = ['e'] * BOARD_SIZE
+        player = 'n'
+        for _ in range(rng.randint(8, 60)):
+            yield state, player
+            produced += 1
+            if produced >= count:
+                return
+            if reference.is_terminal(state):
+                break
+            moves = reference.get_legal_moves(state, player)
+            if not moves:
+                break
+            state = _norm_state(reference.apply_move(state, player, rng.choice(moves)))
+            player = switch_player(player)
+
+
+def random_shift_positions(count, rng):
+    """Positions de deplacement quelconques (4 contre 4), y compris non atteignables."""
+    for _ in range(count):
+        squares = rng.sample(range(BOARD_SIZE), 8)
+        state = ['e'] * BOARD_SIZE
+        for i in squares[:4]:
+            state[i] = 'b'
+        for i in squares[4:]:
+            state[i] = 'n'
+        yield state, rng.choice(('b', 'n'))
+
+
+# -------------------------------------------------------------
+# Comparaison d'une position
+# -------------------------------------------------------------
+def compare_position(reference, candidate, state, player, report):
+    report.positions += 1
+
+    expected = reference.call("phase", state)
+    report.record("phase", state, (), str(expected), candidate.call("phase", state))
+
+    expected = reference.call("game_over", state)
+    report.record("game_over", state, (), str(expected), candidate.call("game_over", state))
+
+    expected = reference.call("is_terminal", state)
+    report.record("is_terminal", state, (), expected, candidate.call("is_terminal", state))
+
+    for who in (player, switch_player(player)):
+        ref_moves = _norm_moves(reference.call("legal_moves", state, who))
+        cand_moves = _norm_moves(candidate.call("legal_moves", state, who))
+        report.record("legal_moves", state, (who,), ref_moves, cand_moves)
+
+        expected = [(tuple(m), _norm_state(c), str(w)) for m, c, w in reference.call("expand", state, who)]
+        got = [(tuple(m), _norm_state(c), str(w)) for m, c, w in candidate.call("expand", state, who)]
+        report.record("expand", state, (who,), expected, got)
+
+        for mv in ref_moves:
+            expected = _norm_state(reference.call("apply_move", state, who, mv))
+            got = _norm_state(candidate.call("apply_move", state, who, mv))
+            report.record("apply_move", state, (who, mv), expected, got)
+
+        # valid_shift : toutes les destinations depuis chaque pion du joueur
+        for frm in range(BOARD_SIZE):
+            if state[frm] != who:
+                continue
+            for to in range(BOARD_SIZE):
+                mv = ("shift", frm, to)
+                expected = reference.call("valid_shift", state, who, mv)
+                got = candidate.call("valid_shift", state, who, mv)
+                report.record("valid_shift", state, (who, mv), bool(expected), bool(got))
+
+
+def run_conformance(reference, candidate, samples=1000, exhaustive_pieces=2, seed=0):
+    """Compare les deux backends (TimedBackend) et renvoie un ConformanceReport."""
+    rng = random.Random(seed)
+    report = ConformanceReport()
+
+    positions = itertools.chain(
+        enumerate_positions(exhaustive_pieces),
+        sample_positions(reference.manager, samples, rng),
+        random_shift_positions(samples // 4, rng),
+    )
+    for state, player in positions:
+        compare_position(reference, candidate, state, player, report)
+
+    return report
+
+
+def print_report(report, reference, candidate, max_shown=20):
+    print(f"\n[Conformance] {report.positions} positions, {report.checks} comparaisons, "
+          f"{len(report.mismatches)} divergence(s)")
+
+    for label, state, args, expected, got in report.mismatches[:max_shown]:
+        print(f"  - {label}{args} sur {state}")
+        print(f"      {reference.name}: {expected}")
+        print(f"      {candidate.name}: {got}")
+
+    print(f"\n{'Appel':<14}{'n':>10}{reference.name + ' (us)':>16}{candidate.name + ' (us)':>18}{'gain':>10}")
+    for label in CHECKED_CALLS:
+        count = reference.stats.get(label, (0, 0.0))[0]
+        if not count:
+            continue
+        ref_us = reference.mean_us(label)
+        cand_us = candidate.mean_us(label)
+        speedup = ref_us / cand_us if cand_us else float("inf")
+        print(f"{label:<14}{count:>10}{ref_us:>16.1f}{cand_us:>18.1f}{speedup:>9.1f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Conformite Prolog vs backend rapide")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="bitboard")
+    parser.add_argument("--samples", type=int, default=1000,
+                        help="nombre de positions tirees par parties aleatoires")
+    parser.add_argument("--exhaustive", type=int, default=2,
+                        help="enumerer toutes les positions de placement jusqu'a ce nombre de pions")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    reference = TimedBackend("prolog", PrologManager())
+    candidate = TimedBackend(args.backend, BACKENDS[args.backend]())
+
+    report = run_conformance(reference, candidate, args.samples, args.exhaustive, args.seed)
+    print_report(report, reference, candidate)
+    return 1 if report.mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
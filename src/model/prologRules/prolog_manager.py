@@ -76,6 +76,18 @@ class PrologManager:
 
         return None
     
+    #expansion d'un noeud : liste de (coup, nouvel etat, gagnant) en un seul appel Prolog
+    def expand(self, state, player):
+        state = python_list_to_prolog(state)
+        res = list(self.prolog.query(f"expand({state}, {player}, Children)"))
+
+        children = []
+        if res:
+            for move, new_state, winner in res[0]["Children"]:
+                children.append((move_to_python(str(move)), [str(x) for x in new_state], str(winner)))
+
+        return children
+    
     #verifier fin de partie
     def is_terminal(self, state):
         state = python_list_to_prolog(state)
@@ -0,0 +1,102 @@
+#Symetries du plateau 5x5 (groupe diedral : 4 rotations x miroir)
+#Les regles du Teeko (voisinage a 8 cases, lignes, diagonales, carres 2x2) sont invariantes
+#par ces 8 transformations : deux positions symetriques ont la meme valeur de jeu.
+#Echanger les couleurs (et le joueur au trait) ne change pas non plus la valeur.
+from operator import itemgetter
+
+from prologRules.bitboard_rules import BOARD_SIZE, WIN_MASKS, ADJACENT, PLACEMENT_MOVES, SHIFT_MOVES
+
+
+def _transform(t, i):
+    x, y = i % 5, i // 5
+    if t & 4:
+        x, y = y, x          # transposition
+    for _ in range(t & 3):
+        x, y = 4 - y, x      # rotation d'un quart de tour
+    return y * 5 + x
+
+
+#TRANSFORMS[t][i] : image de la case i par la transformation t (t = 0 : identite)
+TRANSFORMS = tuple(tuple(_transform(t, i) for i in range(BOARD_SIZE)) for t in range(8))
+
+#INVERSE[t] : transformation qui annule t
+INVERSE = tuple(
+    next(u for u in range(8) if all(TRANSFORMS[u][TRANSFORMS[t][i]] == i for i in range(BOARD_SIZE)))
+    for t in range(8)
+)
+
+
+def transform_mask(mask, t):
+    """Image d'un masque de 25 bits par la transformation t."""
+    perm = TRANSFORMS[t]
+    out = 0
+    while mask:
+        low = mask & -mask
+        out |= 1 << perm[low.bit_length() - 1]
+        mask ^= low
+    return out
+
+
+def canonical_mask(mask):
+    """Renvoie (masque canonique, transformation) : le plus petit des 8 images."""
+    best, best_t = mask, 0
+    for t in range(1, 8):
+        m = transform_mask(mask, t)
+        if m < best:
+            best, best_t = m, t
+    return best, best_t
+
+
+# -------------------------------------------------------------
+# Etats et coups
+# -------------------------------------------------------------
+#_GATHER[t](state) : cases de l'image de state par t (image[TRANSFORMS[t][i]] = state[i])
+_GATHER = tuple(itemgetter(*(TRANSFORMS[INVERSE[t]][j] for j in range(BOARD_SIZE))) for t in range(8))
+
+
+def transform_state(state, t):
+    return list(_GATHER[t](state))
+
+
+def canonical_state(state):
+    """Renvoie (cle canonique "eebn...", transformation) : la plus petite des 8 images."""
+    best, best_t = "".join(state), 0
+    for t in range(1, 8):
+        key = "".join(_GATHER[t](state))
+        if key < best:
+            best, best_t = key, t
+    return best, best_t
+
+
+_SWAP = {'b': 'n', 'n': 'b', 'e': 'e'}
+
+
+#echange des couleurs (le joueur au trait doit etre echange aussi)
+def swap_colours(state):
+    return [_SWAP[v] for v in state]
+
+
+def _move_image(move, t):
+    perm = TRANSFORMS[t]
+    if move[0] == "placement":
+        return PLACEMENT_MOVES[perm[move[1]]]
+    return ("shift", perm[move[1]], perm[move[2]])
+
+
+#MOVE_IMAGES[t][coup] : image d'un coup par t (placements et deplacements adjacents)
+_ALL_MOVES = list(PLACEMENT_MOVES) + [mv for moves in SHIFT_MOVES for _, mv in moves]
+MOVE_IMAGES = tuple({mv: _move_image(mv, t) for mv in _ALL_MOVES} for t in range(8))
+
+
+def transform_move(move, t):
+    """Image d'un coup par t (None si ce n'est ni un placement ni un deplacement adjacent)."""
+    if t == 0:
+        return move
+    return MOVE_IMAGES[t].get(move)
+
+
+# Verification au chargement : les tables des regles sont bien invariantes
+for _t in range(8):
+    assert set(transform_mask(w, _t) for w in WIN_MASKS) == set(WIN_MASKS)
+    assert all(set(TRANSFORMS[_t][j] for j in ADJACENT[i]) == set(ADJACENT[TRANSFORMS[_t][i]])
+               for i in range(BOARD_SIZE))
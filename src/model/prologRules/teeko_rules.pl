@@ -105,4 +105,7 @@ replace([_|T],0,Elem,[Elem|T]).
 replace([H|T],Index,Elem,[H|R]):-Index>0, Index1 is Index -1, replace(T,Index1, Elem, R).
 
 %nouvel etat avec joueur
-generate_new_state(State,Player,Move,NewState):-apply_move(State,Player,Move,NewState).
\ No newline at end of file
+generate_new_state(State,Player,Move,NewState):-apply_move(State,Player,Move,NewState).
+
+%expansion complete d'un noeud en une seule requete : [[Move,NewState,Winner],...]
+expand(State,Player,Children):-findall([Move,NewState,Winner],(legal_move(State,Player,Move),apply_move(State,Player,Move,NewState),game_over(NewState,Winner)),Children).
\ No newline at end of file
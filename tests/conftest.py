@@ -0,0 +1,51 @@
+"""
+Configuration commune des tests : les modules du modèle s'importent comme dans le
+moteur (prologRules.x, ai.x), sans SWI-Prolog (règles bitboard uniquement).
+"""
+import os
+import random
+import sys
+
+import pytest
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "model")
+if MODEL_DIR not in sys.path:
+    sys.path.insert(0, MODEL_DIR)
+
+from prologRules.bitboard_rules import BitboardRules  # noqa: E402
+
+
+def play_random_games(count, seed, max_plies=40):
+    """Parties aléatoires : liste de [(état, joueur au trait, coup joué), ...]."""
+    rules = BitboardRules()
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        state, player = ['e'] * 25, 'n'
+        game = []
+        for _ in range(rng.randint(1, max_plies)):
+            move = rng.choice(rules.get_legal_moves(state, player))
+            game.append((state, player, move))
+            state = rules.apply_move(state, player, move)
+            player = 'b' if player == 'n' else 'n'
+            if rules.winner(state) != 'none':
+                break
+        game.append((state, player, None))
+        games.append(game)
+    return games
+
+
+@pytest.fixture(scope="session")
+def rules():
+    return BitboardRules()
+
+
+@pytest.fixture(scope="session")
+def games():
+    return play_random_games(200, seed=2024)
+
+
+@pytest.fixture(scope="session")
+def positions(games):
+    """Toutes les positions des parties aléatoires, (état, joueur au trait)."""
+    return [(state, player) for game in games for state, player, _ in game]
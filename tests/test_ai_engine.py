@@ -0,0 +1,28 @@
+"""AIEngine : états acceptés en entrée (TeekoState ou liste avec joueur)."""
+import pytest
+
+from prologRules.bitboard_rules import TeekoState
+from ai.ai_engine import AIEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    # PvsP : aucune table ni recherche construite tant qu'aucun coup n'est demandé
+    engine = AIEngine(rules="bitboard", mode="PvsP")
+    yield engine
+    engine.shutdown()
+
+
+def test_list_state_requires_a_player(engine):
+    with pytest.raises(ValueError):
+        engine.get_best_move(['e'] * 25)
+    with pytest.raises(ValueError):
+        engine.get_best_move_async(['e'] * 25)
+
+
+def test_state_conversion(engine):
+    state = ['e'] * 25
+    state[12] = 'n'
+    ts, player = engine.as_teeko_state(state, 'b')
+    assert ts == TeekoState.from_list(state, 'b') and player == 'b'
+    assert engine.as_teeko_state(ts, None) == (ts, 'b')
@@ -0,0 +1,87 @@
+"""Règles bitboard : coups légaux, gagnant et application des coups, comparés aux règles Prolog."""
+import pytest
+
+from prologRules.bitboard_rules import ADJACENT, WINNING_POSITIONS, mask_winner, masks_to_state, state_to_masks
+
+
+#version liste des regles de teeko_rules.pl, sans masques
+def reference_legal_moves(state, player):
+    if sum(1 for v in state if v != 'e') < 8:
+        return [("placement", i) for i in range(25) if state[i] == 'e']
+    return [("shift", i, j) for i in range(25) if state[i] == player for j in ADJACENT[i] if state[j] == 'e']
+
+
+def reference_winner(state):
+    for player in ('b', 'n'):
+        if any(all(state[i] == player for i in p) for p in WINNING_POSITIONS):
+            return player
+    return 'none'
+
+
+def test_adjacency_is_eight_neighbourhood():
+    assert ADJACENT[0] == (1, 5, 6)
+    assert ADJACENT[12] == (6, 7, 8, 11, 13, 16, 17, 18)
+    assert all(i in ADJACENT[j] for i in range(25) for j in ADJACENT[i])
+
+
+def test_legal_moves_match_reference(rules, positions):
+    for state, player in positions:
+        assert rules.get_legal_moves(state, player) == reference_legal_moves(state, player)
+
+
+def test_winner_matches_reference(rules, positions):
+    for state, _ in positions:
+        assert rules.winner(state) == reference_winner(state)
+        assert rules.is_terminal(state) == (reference_winner(state) != 'none')
+
+
+@pytest.mark.parametrize("squares", [(0, 1, 2, 3), (4, 9, 14, 19), (4, 8, 12, 16), (17, 18, 22, 23)])
+def test_each_kind_of_pattern_wins(rules, squares):
+    state = ['e'] * 25
+    for i in squares:
+        state[i] = 'b'
+    assert rules.winner(state) == 'b'
+    state[squares[-1]] = 'n'
+    assert rules.winner(state) == 'none'
+
+
+def test_b_is_checked_before_n():
+    b, n = state_to_masks(['b'] * 4 + ['e'] + ['n'] * 4 + ['e'] * 16)
+    assert mask_winner(b, n) == 'b'
+
+
+def test_apply_move(rules):
+    state = ['e'] * 25
+    state = rules.apply_move(state, 'n', ("placement", 12))
+    assert state[12] == 'n'
+    assert rules.apply_move(state, 'b', ("placement", 12)) is None
+
+    full = ['n', 'n', 'n', 'e', 'b', 'n', 'b', 'b', 'b'] + ['e'] * 16
+    moved = rules.apply_move(full, 'b', ("shift", 4, 3))
+    assert moved[4] == 'e' and moved[3] == 'b'
+
+
+def test_validate_move(rules):
+    state = ['e'] * 25
+    assert rules.validate_move(state, 'n', ("placement", 0))
+    assert not rules.validate_move(state, 'n', ("shift", 0, 1))
+
+    full = ['n', 'n', 'n', 'e', 'b', 'n', 'b', 'b', 'b'] + ['e'] * 16
+    assert not rules.validate_move(full, 'b', ("placement", 3))
+    assert rules.validate_move(full, 'b', ("shift", 4, 3))
+    assert not rules.validate_move(full, 'b', ("shift", 4, 10))   # non adjacent
+    assert not rules.validate_move(full, 'b', ("shift", 0, 3))    # pion adverse
+
+
+def test_expand_matches_apply_move(rules, positions):
+    for state, player in positions[::7]:
+        children = rules.expand(state, player)
+        assert [mv for mv, _, _ in children] == rules.get_legal_moves(state, player)
+        for mv, child, winner in children:
+            assert child == rules.apply_move(state, player, mv)
+            assert winner == rules.winner(child)
+
+
+def test_masks_round_trip(positions):
+    for state, _ in positions:
+        assert masks_to_state(*state_to_masks(state)) == state
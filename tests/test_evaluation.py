@@ -0,0 +1,73 @@
+"""Évaluation : version par masques, vectorisée, incrémentale et cache des scores."""
+import pytest
+
+import ai.evaluation as evaluation
+from ai.eval_cache import EvalCache
+from ai.evaluation import Evaluation, IncrementalEvaluation
+
+
+@pytest.fixture(scope="module")
+def evaluator(rules):
+    return Evaluation(rules)
+
+
+def test_known_scores(evaluator):
+    empty = ['e'] * 25
+    assert evaluator.evaluate(empty, 'n') == 0
+
+    won = ['n'] * 4 + ['e'] * 21
+    assert evaluator.evaluate(won, 'n') == 10000
+    assert evaluator.evaluate(won, 'b') == -10000
+
+    centre = list(empty)
+    centre[12] = 'n'
+    assert evaluator.evaluate(centre, 'n') == -evaluator.evaluate(centre, 'b') > 0
+
+
+@pytest.mark.parametrize("player", ['b', 'n'])
+def test_batch_matches_evaluate(evaluator, positions, player):
+    states = [state for state, _ in positions]
+    assert evaluator.evaluate_batch(states, player) == [evaluator.evaluate(s, player) for s in states]
+
+
+def test_batch_without_numpy(evaluator, positions, monkeypatch):
+    monkeypatch.setattr(evaluation, "np", None)
+    states = [state for state, _ in positions[:100]]
+    assert evaluator.evaluate_batch(states, 'n') == [evaluator.evaluate(s, 'n') for s in states]
+
+
+def test_incremental_matches_evaluate(evaluator, games):
+    inc = IncrementalEvaluation(evaluator.tables)
+    for game in games:
+        inc.reset(game[0][0])
+        for state, player, move in game:
+            for p in 'bn':
+                assert inc.score(p) == evaluator.evaluate(state, p)
+            if move is not None:
+                inc.push(player, move)
+
+        # retour à la position de départ par pop()
+        for _ in game[:-1]:
+            inc.pop()
+        assert inc.score('n') == evaluator.evaluate(game[0][0], 'n')
+
+
+def test_incremental_reset_matches_evaluate(evaluator, positions):
+    inc = IncrementalEvaluation(evaluator.tables)
+    for state, player in positions[::3]:
+        inc.reset(state)
+        assert inc.relative_score(player, 'n') == (1 if player == 'n' else -1) * evaluator.evaluate(state, 'n')
+
+
+def test_eval_cache():
+    cache = EvalCache(capacity=1000)
+    assert cache.capacity == 1024
+    assert cache.get(5) is None
+    cache.put(5, -42)
+    assert cache.get(5) == -42
+    cache.put(5 + 1024, 7)                   # même slot : remplace
+    assert cache.get(5) is None and cache.get(5 + 1024) == 7
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2 and stats["fill"] == 1 / 1024
+    cache.clear()
+    assert cache.get(5 + 1024) is None
@@ -0,0 +1,39 @@
+"""Lazy SMP : helpers prêts avant la première recherche, fins de recherches abandonnées ignorées."""
+import time
+
+import pytest
+
+from ai.lazy_smp import LazySMP
+from ai.transposition import SharedTranspositionTable
+
+STATE = ['n', 'e', 'e', 'b', 'e',
+         'e', 'b', 'e', 'n', 'e',
+         'e', 'e', 'b', 'e', 'e',
+         'e', 'n', 'e', 'b', 'e',
+         'e', 'e', 'e', 'e', 'n']
+
+
+@pytest.fixture
+def smp():
+    tt = SharedTranspositionTable(1)
+    smp = LazySMP(2, tt, difficulty="Expert", mode="PvsIA", rules="bitboard")
+    yield smp
+    smp.shutdown()
+
+
+def test_first_search_uses_the_helpers(smp):
+    smp.warm_up()
+    smp.start_search(STATE, 'n', 5, 5.0)
+    time.sleep(0.5)
+    assert smp.stop_search() > 0
+
+
+def test_stale_results_are_dropped(smp):
+    smp.warm_up()
+    smp.start_search(STATE, 'n', 5, 5.0)
+    # fin tardive d'une recherche précédente, abandonnée par stop_search
+    smp.done.put(("done", smp.search_id - 1, 0, 10 ** 9))
+    time.sleep(0.3)
+    nodes = smp.stop_search()
+    assert 0 < nodes < 10 ** 9
+    assert smp.running == 0
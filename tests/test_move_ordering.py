@@ -0,0 +1,75 @@
+"""Ordonnancement des coups : coup de la table, gains, blocages, killers puis historique."""
+import time
+
+import pytest
+
+from prologRules.bitboard_rules import mask_legal_moves, state_to_masks
+from prologRules.symmetry import transform_move
+from ai.evaluation import Evaluation
+from ai.minmax_alphabeta import INF, MinMaxAlphaBeta
+from ai.move_ordering import HISTORY_MAX, MoveOrdering
+from ai.transposition import EXACT
+from ai.zobrist import canonical_key
+
+
+def mask_of(squares):
+    return sum(1 << i for i in squares)
+
+
+@pytest.fixture(scope="module")
+def evaluator(rules):
+    return Evaluation(rules)
+
+
+def test_wins_then_blocks_then_killers(evaluator):
+    ordering = MoveOrdering(evaluator.tables)
+    own, opp = mask_of((0, 1, 2)), mask_of((10, 11, 12))   # gain en 3, blocage en 13
+    ordering.cutoff(("placement", 20), 2, 3)
+    ordering.cutoff(("placement", 22), 2, 3)
+    ordering.cutoff(("placement", 24), 5, 6)                # historique seulement à ply 2
+
+    moves = mask_legal_moves(own, opp)
+    ordered = ordering.order(moves, own, opp, 2)
+    assert sorted(ordered) == sorted(moves)
+    assert ordered[:5] == [("placement", 3), ("placement", 13), ("placement", 22), ("placement", 20),
+                           ("placement", 24)]
+    # sans killers ni historique : case la plus centrale d'abord
+    assert ordered[5] == ("placement", 7)
+
+
+def test_shift_from_the_pattern_is_not_a_win(evaluator):
+    ordering = MoveOrdering(evaluator.tables)
+    own, opp = mask_of((0, 1, 2, 8)), mask_of((20, 21, 23, 24))
+    ordered = ordering.order(mask_legal_moves(own, opp), own, opp, 1)
+    assert ordered[0] == ("shift", 8, 3)
+    assert ordered.index(("shift", 2, 3)) > 0
+
+
+def test_history_is_aged(evaluator):
+    ordering = MoveOrdering(evaluator.tables)
+    depth = 10
+    while max(ordering.history) <= HISTORY_MAX // 2:
+        ordering.cutoff(("placement", 0), 1, depth)
+    assert max(ordering.history) <= HISTORY_MAX
+    ordering.new_search()
+    assert ordering.killers[1] == [None, None]
+    assert 0 < max(ordering.history) <= HISTORY_MAX // 2
+
+
+def test_hash_move_is_searched_first(rules, evaluator):
+    state, player = ['e'] * 25, 'n'
+    state[12], state[6], state[18] = 'n', 'b', 'b'
+    search = MinMaxAlphaBeta(rules, evaluator, None)
+    search.root_player, search.start_time = player, time.perf_counter()
+    search.board.reset(state)
+
+    # coup peu prometteur, stocké moins profond que la recherche : ordre seulement
+    hash_move = ("placement", 24)
+    tt_key, sym = canonical_key(search.board.key, player, player)
+    search.tt.store(tt_key, 0, 1, EXACT, transform_move(hash_move, sym))
+
+    played = []
+    make = search.board.make
+    search.board.make = lambda p, mv: (played.append(mv), make(p, mv))
+    assert search._negamax(player, 2, -INF, INF) is not None
+    assert played[0] == hash_move
@@ -0,0 +1,155 @@
+"""Recherche : PVS, fenêtres d'aspiration, negamax et quiescence face à des recherches de référence."""
+import random
+import time
+
+import pytest
+
+from prologRules.ia_helper import switch_player
+from ai.evaluation import Evaluation
+from ai.minmax_alphabeta import INF, MinMaxAlphaBeta
+
+
+#alpha-beta de reference sur des listes, sans table ni ordonnancement
+def reference_alphabeta(rules, evaluator, state, player, root, depth, alpha=-INF, beta=INF):
+    winner = rules.winner(state)
+    if winner != 'none' or depth == 0:
+        value = evaluator.evaluate(state, root, winner)
+        return value if player == root else -value
+    moves = rules.get_legal_moves(state, player)
+    if not moves:
+        return -INF
+    best = -INF
+    for mv in moves:
+        child = rules.apply_move(state, player, mv)
+        best = max(best, -reference_alphabeta(rules, evaluator, child, switch_player(player), root, depth - 1,
+                                              -beta, -alpha))
+        alpha = max(alpha, best)
+        if alpha >= beta:
+            break
+    return best
+
+
+#minimax sans elagage, valeurs vues de `root` : maximum pour root, minimum pour l'adversaire
+def reference_minimax(rules, evaluator, state, player, root, depth):
+    winner = rules.winner(state)
+    if winner != 'none' or depth == 0:
+        return evaluator.evaluate(state, root, winner)
+    moves = rules.get_legal_moves(state, player)
+    if not moves:
+        return -INF if player == root else INF
+    values = [reference_minimax(rules, evaluator, rules.apply_move(state, player, mv), switch_player(player), root,
+                                depth - 1) for mv in moves]
+    return max(values) if player == root else min(values)
+
+
+def negamax(search, state, player, depth):
+    """Valeur de _negamax à la racine, fenêtre complète, sans passer par compute()."""
+    search.root_player = player
+    search.start_time = time.perf_counter()
+    search.board.reset(state)
+    return search._negamax(player, depth, -INF, INF)
+
+
+@pytest.fixture(scope="module")
+def evaluator(rules):
+    return Evaluation(rules)
+
+
+@pytest.fixture(scope="module")
+def samples(rules, positions):
+    """Positions non terminales : (placement, déplacement), 6 de chaque."""
+    rng = random.Random(11)
+    live = [(s, p) for s, p in positions if rules.winner(s) == 'none']
+    placement = [(s, p) for s, p in live if rules.get_phase(s) == "placement" and s.count('e') < 23]
+    shifting = [(s, p) for s, p in live if rules.get_phase(s) == "deplacement"]
+    return rng.sample(placement, 6), rng.sample(shifting, 6)
+
+
+def test_negamax_matches_minimax(rules, evaluator, samples):
+    placement, shifting = samples
+    for state, player in placement + shifting:
+        depth = 3 if (state, player) in shifting else 2
+        search = MinMaxAlphaBeta(rules, evaluator, None)
+        expected = reference_minimax(rules, evaluator, state, player, player, depth)
+        assert negamax(search, state, player, depth) == expected
+
+
+def test_pvs_matches_alphabeta(rules, evaluator, samples):
+    for state, player in samples[0] + samples[1]:
+        search = MinMaxAlphaBeta(rules, evaluator, None, pvs=True)
+        expected = reference_alphabeta(rules, evaluator, state, player, player, 3)
+        assert negamax(search, state, player, 3) == expected
+
+
+def test_aspiration_matches_full_window(rules, evaluator, samples):
+    retries = 0
+    for state, player in samples[1]:
+        full = MinMaxAlphaBeta(rules, evaluator, None, max_depth=4, pvs=True)
+        narrow = MinMaxAlphaBeta(rules, evaluator, None, max_depth=4, pvs=True, aspiration=1)
+        score, _ = full.compute(state, player)
+        narrow_score, move = narrow.compute(state, player)
+        retries += narrow.last_stats["aspiration_retries"]
+
+        assert narrow_score == score
+        if score < 9000:
+            # à égalité de score, le coup peut différer : il doit atteindre ce score
+            child = rules.apply_move(state, player, move)
+            assert -reference_alphabeta(rules, evaluator, child, switch_player(player), player, 3) == score
+    # une fenêtre de largeur 1 échoue : les nouvelles recherches ont bien été faites
+    assert retries > 0
+
+
+class CountingManager:
+    """Manager hors bitboard (comme PrologManager) : délègue aux règles et compte les générations."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.calls = 0
+
+    def get_legal_moves(self, state, player):
+        self.calls += 1
+        return self.rules.get_legal_moves(state, player)
+
+    def __getattr__(self, name):
+        return getattr(self.rules, name)
+
+
+def test_other_backend_generates_interior_moves(rules, evaluator, samples):
+    for state, player in samples[0][:2] + samples[1][:2]:
+        manager = CountingManager(rules)
+        search = MinMaxAlphaBeta(manager, evaluator, None, pvs=True)
+        expected = negamax(MinMaxAlphaBeta(rules, evaluator, None, pvs=True), state, player, 3)
+        assert negamax(search, state, player, 3) == expected
+        # racine et noeuds internes
+        assert manager.calls > 1
+
+
+def board_of(black, white):
+    state = ['e'] * 25
+    for i in black:
+        state[i] = 'n'
+    for i in white:
+        state[i] = 'b'
+    return state
+
+
+def test_quiescence_sees_a_fork_past_the_horizon(rules, evaluator):
+    # 'n' pose en 8 (ou 5) : deux cases gagnantes sur la ligne 5-9, 'b' n'en bloque qu'une
+    state = board_of((6, 7), (0, 24))
+    blind = MinMaxAlphaBeta(rules, evaluator, None)
+    assert abs(negamax(blind, state, 'n', 1)) < 9000
+    search = MinMaxAlphaBeta(rules, evaluator, None, quiescence=2)
+    assert negamax(search, state, 'n', 1) == 10000
+
+
+def test_quiescence_requires_the_block(rules, evaluator):
+    # 'b' gagne en 8 -> 3 ; seul 4 -> 3 l'en empêche
+    state = board_of((4, 20, 22, 24), (0, 1, 2, 8))
+    # sans blocage, la feuille est gagnée par 'b' au trait, au-delà de l'horizon
+    quiet = rules.apply_move(state, 'n', ("shift", 20, 15))
+    assert abs(negamax(MinMaxAlphaBeta(rules, evaluator, None), quiet, 'b', 0)) < 9000
+    assert negamax(MinMaxAlphaBeta(rules, evaluator, None, quiescence=4), quiet, 'b', 0) == 10000
+
+    search = MinMaxAlphaBeta(rules, evaluator, None, max_depth=1, quiescence=4)
+    score, move = search.compute(state, 'n')
+    assert move == ("shift", 4, 3) and score > -9000
@@ -0,0 +1,65 @@
+"""Worker de recherche : arrêt propre, sans processus orphelins (pool, helpers Lazy SMP)."""
+import os
+import time
+
+import pytest
+
+from ai.ai_engine import AIEngine
+
+pytestmark = pytest.mark.skipif(not os.path.isdir("/proc"), reason="processus lus dans /proc (Linux)")
+
+STATE = ['n', 'e', 'e', 'b', 'e',
+         'e', 'b', 'e', 'n', 'e',
+         'e', 'e', 'b', 'e', 'e',
+         'e', 'n', 'e', 'b', 'e',
+         'e', 'e', 'e', 'e', 'n']
+
+
+def descendants(pid):
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    found, todo = [], [pid]
+    while todo:
+        for child in children.get(todo.pop(), []):
+            found.append(child)
+            todo.append(child)
+    return found
+
+
+def running(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+
+@pytest.mark.parametrize("difficulty, workers", [("Intermediaire", 2), ("Expert", 3)])
+def test_shutdown_leaves_no_process(difficulty, workers):
+    engine = AIEngine(difficulty=difficulty, mode="PvsIA", rules="bitboard", worker="process", workers=workers)
+    try:
+        assert engine.get_best_move_async(STATE, 'n').result(timeout=120) is not None
+        process = engine.search_worker.process
+        spawned = descendants(process.pid)
+        # pool de la recherche parallèle ou helpers Lazy SMP
+        assert len(spawned) >= workers - 1
+    finally:
+        start = time.perf_counter()
+        engine.shutdown()
+        elapsed = time.perf_counter() - start
+
+    # sortie propre du worker, sans terminate()
+    assert process.exitcode == 0
+    assert elapsed < 1.0
+    deadline = time.time() + 5
+    while any(running(pid) for pid in spawned) and time.time() < deadline:
+        time.sleep(0.05)
+    assert not [pid for pid in spawned if running(pid)]
@@ -0,0 +1,50 @@
+"""Symétries du plateau et clé canonique (symétries et échange des couleurs)."""
+from prologRules.bitboard_rules import state_to_masks
+from prologRules.symmetry import (INVERSE, TRANSFORMS, canonical_mask, canonical_state, swap_colours,
+                                  transform_mask, transform_move, transform_state)
+from ai.zobrist import MOVER_IS_ROOT_KEY, canonical_key, hash_state
+
+
+def test_transforms_are_permutations():
+    assert TRANSFORMS[0] == tuple(range(25))
+    assert len(set(TRANSFORMS)) == 8
+    for t in range(8):
+        assert sorted(TRANSFORMS[t]) == list(range(25))
+        assert all(TRANSFORMS[INVERSE[t]][TRANSFORMS[t][i]] == i for i in range(25))
+
+
+def test_canonical_state_is_shared_by_all_images(positions):
+    for state, _ in positions[::5]:
+        key, t = canonical_state(state)
+        assert "".join(transform_state(state, t)) == key
+        for u in range(8):
+            assert canonical_state(transform_state(state, u))[0] == key
+
+
+def test_transform_mask_matches_transform_state(positions):
+    for state, _ in positions[::5]:
+        b, n = state_to_masks(state)
+        for t in range(8):
+            assert state_to_masks(transform_state(state, t)) == (transform_mask(b, t), transform_mask(n, t))
+        best, t = canonical_mask(b)
+        assert best == transform_mask(b, t) == min(transform_mask(b, u) for u in range(8))
+
+
+def test_transform_move_maps_legal_moves(rules, positions):
+    for state, player in positions[::5]:
+        moves = rules.get_legal_moves(state, player)
+        for t in range(8):
+            image = rules.get_legal_moves(transform_state(state, t), player)
+            assert sorted(transform_move(mv, t) for mv in moves) == sorted(image)
+
+
+def test_canonical_key_merges_symmetries_and_colours(positions):
+    for state, player in positions[::5]:
+        other = 'b' if player == 'n' else 'n'
+        key, _ = canonical_key(hash_state(state), player, player)
+        for u in range(8):
+            assert canonical_key(hash_state(transform_state(state, u)), player, player)[0] == key
+        # couleurs échangées et trait au camp opposé : même position
+        assert canonical_key(hash_state(swap_colours(state)), other, other)[0] == key
+        # trait au joueur racine ou non : entrées distinctes
+        assert canonical_key(hash_state(state), player, other)[0] == key ^ MOVER_IS_ROOT_KEY
@@ -0,0 +1,58 @@
+"""Indexation de la table de finales : rang colex et index invariant par symétrie."""
+import random
+from itertools import combinations
+from math import comb
+
+from prologRules.symmetry import transform_mask
+from ai.tablebase import (DECODED, DRAW, FREE_SQUARES, LOSS, PIECES_PER_PLAYER, POSITIONS_PER_CLASS, TABLE_SIZE,
+                          WIN, free_rank, position_index)
+
+
+def mask_of(squares):
+    return sum(1 << i for i in squares)
+
+
+def test_free_rank_is_colex_bijection():
+    ranks = [free_rank(mask_of(c), 0) for c in combinations(range(FREE_SQUARES), PIECES_PER_PLAYER)]
+    assert sorted(ranks) == list(range(comb(FREE_SQUARES, PIECES_PER_PLAYER)))
+    # ordre colex : le plus grand élément décide
+    assert free_rank(mask_of((0, 1, 2, 3)), 0) == 0
+    assert free_rank(mask_of((0, 1, 2, 4)), 0) == 1
+
+
+def test_free_rank_skips_occupied_squares():
+    occupied = mask_of((0, 6, 12, 18))
+    free = [i for i in range(25) if not occupied >> i & 1]
+    ranks = {free_rank(mask_of(c), occupied) for c in combinations(free, PIECES_PER_PLAYER)}
+    assert ranks == set(range(POSITIONS_PER_CLASS))
+
+
+def test_position_index_is_symmetric():
+    # seul le masque du joueur au trait est canonisé : l'invariance vaut s'il n'a pas de symétrie propre
+    rng = random.Random(7)
+    checked = 0
+    while checked < 300:
+        squares = rng.sample(range(25), 8)
+        mover, opponent = mask_of(squares[:4]), mask_of(squares[4:])
+        if len({transform_mask(mover, t) for t in range(8)}) < 8:
+            continue
+        index = position_index(mover, opponent)
+        assert 0 <= index < TABLE_SIZE
+        for t in range(8):
+            assert position_index(transform_mask(mover, t), transform_mask(opponent, t)) == index
+        checked += 1
+
+
+def test_position_index_is_bijective_within_class():
+    mover = mask_of((0, 6, 12, 18))
+    free = [i for i in range(25) if not mover >> i & 1]
+    indices = {position_index(mover, mask_of(c)) for c in combinations(free, PIECES_PER_PLAYER)}
+    base = min(indices)
+    assert base % POSITIONS_PER_CLASS == 0
+    assert indices == set(range(base, base + POSITIONS_PER_CLASS))
+
+
+def test_decoded_results():
+    assert DECODED[0] == (DRAW, None)
+    assert DECODED[2] == (WIN, 1)
+    assert DECODED[3] == (LOSS, 2)
@@ -0,0 +1,43 @@
+"""TeekoState : lecture comme une liste, coups, hachage et évaluation."""
+from prologRules.bitboard_rules import TeekoState
+from ai.evaluation import Evaluation
+from ai.zobrist import hash_state
+
+
+def test_teeko_state_reads_like_a_list(rules, positions):
+    for state, player in positions:
+        ts = TeekoState.from_list(state, player)
+        assert ts.to_list() == state and list(ts) == state
+        assert [ts[i] for i in range(25)] == state and ts[-1] == state[-1]
+        assert all(ts.count(v) == state.count(v) for v in 'ebn')
+        assert ts.pieces == 25 - state.count('e')
+        assert ts.phase() == rules.get_phase(state)
+        assert ts.winner() == rules.winner(state)
+        assert ts.positions(player) == rules.get_player_positions(state, player)
+        assert ts.legal_moves() == rules.get_legal_moves(state, player)
+
+
+def test_teeko_state_play_and_hash(rules, games):
+    for game in games:
+        for state, player, move in game[:-1]:
+            ts = TeekoState.from_list(state, player)
+            child = ts.play(move)
+            expected = TeekoState.from_list(rules.apply_move(state, player, move), 'b' if player == 'n' else 'n')
+            assert child == expected and hash(child) == hash(expected)
+
+    ts = TeekoState.from_list(['n'] + ['e'] * 24, 'b')
+    assert ts != TeekoState.from_list(['n'] + ['e'] * 24, 'n')
+    assert len({ts, TeekoState(ts.b, ts.n, 'b')}) == 1
+
+
+def test_hash_of_teeko_state_matches_list(positions):
+    for state, player in positions:
+        assert hash_state(TeekoState.from_list(state, player)) == hash_state(state)
+
+
+def test_teeko_state_scores_like_list(rules, positions):
+    evaluator = Evaluation(rules)
+    for state, player in positions:
+        ts = TeekoState.from_list(state, player)
+        for p in 'bn':
+            assert evaluator.evaluate(ts, p) == evaluator.evaluate(state, p)
@@ -0,0 +1,95 @@
+"""Tables de transposition : codage des entrées, buckets, table partagée."""
+import pytest
+
+from ai.transposition import (ENTRY_BYTES, EXACT, LOWER, MOVES_BY_CODE, UPPER, CompactTranspositionTable,
+                              SharedTranspositionTable, TranspositionTable, encode_move)
+
+
+def test_simple_table_depth_preference():
+    tt = TranspositionTable(capacity=8)
+    tt.store(3, 10, 4, EXACT, ("placement", 1))
+    tt.store(11, 20, 2, EXACT, None)         # même slot, moins profond : ignoré
+    assert tt.probe(3) == (10, 4, EXACT, ("placement", 1)) and tt.probe(11) is None
+    tt.new_search()
+    tt.store(11, 20, 2, EXACT, None)
+    assert tt.probe(11) == (20, 2, EXACT, None)
+
+
+def one_bucket_table():
+    # deux slots : un bucket (slot profondeur, slot toujours)
+    return CompactTranspositionTable(buffer=bytearray(2 * ENTRY_BYTES))
+
+
+def test_move_codes_round_trip():
+    assert encode_move(None) == 0 and MOVES_BY_CODE[0] is None
+    for i in range(25):
+        assert MOVES_BY_CODE[encode_move(("placement", i))] == ("placement", i)
+        for j in range(25):
+            assert MOVES_BY_CODE[encode_move(("shift", i, j))] == ("shift", i, j)
+
+
+@pytest.mark.parametrize("value", [0, 1, -1, 10000, -10000, 99999, -(10 ** 9)])
+@pytest.mark.parametrize("flag", [EXACT, LOWER, UPPER])
+def test_compact_entry_round_trip(value, flag):
+    tt = CompactTranspositionTable(size_mb=0.01)
+    key = 0x1234_5678_9ABC_DEF0
+    tt.store(key, value, 7, flag, ("shift", 6, 12))
+    assert tt.probe(key) == (value, 7, flag, ("shift", 6, 12))
+    assert tt.probe(key ^ 1) is None
+
+
+def test_compact_keeps_known_move():
+    tt = CompactTranspositionTable(size_mb=0.01)
+    tt.store(42, 5, 2, LOWER, ("placement", 3))
+    tt.store(42, 8, 3, EXACT, None)
+    assert tt.probe(42) == (8, 3, EXACT, ("placement", 3))
+
+
+def test_compact_rejects_corrupted_entry():
+    tt = one_bucket_table()
+    tt.store(7, 5, 2, EXACT, None)
+    tt.data[0] ^= 1 << 45
+    assert tt.probe(7) is None
+
+
+def test_bucket_replacement():
+    tt = one_bucket_table()
+    tt.store(10, 1, 5, EXACT, None)      # slot profondeur
+    tt.store(11, 2, 2, EXACT, None)      # moins profond : slot toujours
+    assert tt.probe(10) and tt.probe(11)
+
+    tt.store(12, 3, 1, EXACT, None)      # remplace la plus récente, garde la plus profonde
+    assert tt.probe(10) and tt.probe(12) and tt.probe(11) is None
+
+    tt.store(13, 4, 6, EXACT, None)      # plus profond : l'ancienne descend dans le slot toujours
+    assert tt.probe(13) and tt.probe(10) and tt.probe(12) is None
+    assert tt.replacements == 2
+
+    tt.new_search()
+    tt.store(14, 5, 0, EXACT, None)      # entrée d'une recherche précédente : remplaçable
+    assert tt.probe(14) and tt.probe(13) and tt.probe(10) is None
+
+
+def test_compact_fill_and_clear():
+    tt = CompactTranspositionTable(size_mb=0.01)
+    assert tt.stats()["fill"] == 0
+    for key in range(1, tt.slots):
+        tt.store(key * 7919, key, 1, EXACT, None)
+    assert tt.stats()["fill"] > 0.5
+    tt.clear()
+    assert tt.stats()["fill"] == 0 and tt.probe(7919) is None
+
+
+def test_shared_table_sees_other_handles():
+    owner = SharedTranspositionTable(size_mb=0.05)
+    other = SharedTranspositionTable(name=owner.name)
+    try:
+        other.store(99, -250, 4, UPPER, ("placement", 12))
+        assert owner.probe(99) == (-250, 4, UPPER, ("placement", 12))
+        for key in range(1, 2000):
+            other.store(key * 104729, key, 1, EXACT, None)
+        # le remplissage est lu dans le tampon : il compte les écritures de l'autre handle
+        assert owner.stats()["fill"] == other.stats()["fill"] > 0
+    finally:
+        other.close()
+        owner.close()
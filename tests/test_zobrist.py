@@ -0,0 +1,11 @@
+"""Clés de Zobrist : la mise à jour incrémentale redonne le hachage complet."""
+from ai.zobrist import hash_state, update_key
+
+
+def test_incremental_key_matches_full_hash(rules, games):
+    for game in games:
+        key = hash_state(game[0][0])
+        for state, player, move in game:
+            assert key == hash_state(state)
+            if move is not None:
+                key = update_key(key, player, move)